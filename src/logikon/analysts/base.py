@@ -14,6 +14,10 @@ SYSTEM_MESSAGE_PROMPT = (
     "Be concise."
 )
 
+# Prompts that analyse a text start with this block, so that backends with
+# prefix caching prefill the (long) text only once across analysts.
+TEXT_PREFIX_PROMPT = "Let's study the following text carefully.\n\n<TEXT>\n{prompt}{completion}\n</TEXT>\n\n"
+
 
 class AbstractAnalyst(Analyst):
     """
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 import logikon.schemas.argument_mapping as am
@@ -11,6 +12,12 @@ from logikon.schemas.pros_cons import Claim
 
 MAX_CLAIMS_RELEVANCE = 10
 
+# dialectic relation classes and their verbalizations used as candidate labels
+_DIAREL_CLASSES = [am.SUPPORT, am.ATTACK, am.NEUTRAL]
+_DIAREL_CLASSES_VERBALIZED = ["directly confirmed by", "directly disconfirmed by", "independent of"]
+_DIAREL_CLASS_BY_VERBALIZED = dict(zip(_DIAREL_CLASSES_VERBALIZED, _DIAREL_CLASSES))
+_DIAREL_IDX = {c: i for i, c in enumerate(_DIAREL_CLASSES)}
+
 
 async def dialectic_relations(
     arguments: Claim | list[Claim], claims: Claim | list[Claim], classifier: HfClassifier
@@ -28,8 +35,8 @@ async def dialectic_relations(
     # templates and classes
     text_template = "Claim: {topic}. Reason: {argument}."
     hypothesis_template = "The claim is {} the given reason."
-    classes_verbalized = ["directly confirmed by", "directly disconfirmed by", "independent of"]
-    classes = [am.SUPPORT, am.ATTACK, am.NEUTRAL]
+    classes_verbalized = _DIAREL_CLASSES_VERBALIZED
+    classes = _DIAREL_CLASSES
 
     # prepare inputs
     inputs = [
@@ -61,11 +68,10 @@ async def dialectic_relations(
     results: list[MultipleChoiceResult] = []
     for cres in classification_results:
         if isinstance(cres, HfClassification):
-            probs = {k: cres.scores[cres.labels.index(v)] for k, v in zip(classes, classes_verbalized)}
-            label_max = next(
-                k for k, v in zip(classes, classes_verbalized) if v == cres.labels[0]
-            )  # labels are sorted by score
-            idx_max = classes.index(label_max)
+            scores = dict(zip(cres.labels, cres.scores))
+            probs = {k: scores[v] for k, v in zip(classes, classes_verbalized)}
+            label_max = _DIAREL_CLASS_BY_VERBALIZED[cres.labels[0]]  # labels are sorted by score
+            idx_max = _DIAREL_IDX[label_max]
             result = MultipleChoiceResult(probs=probs, label_max=label_max, idx_max=idx_max, choices=classes)
             results.append(result)
         else:
@@ -167,6 +173,7 @@ async def most_relevant(
         idxs = [i for i, cv in enumerate(classes_verbalized) if cv == unique_cverb]
         partitions.append(
             {
+                "idxs": idxs,
                 "inputs": [inputs[i] for i in idxs],
                 "claims_sets": [claims_sets[i] for i in idxs],
                 "classes_verbalized": list(unique_cverb),
@@ -174,32 +181,41 @@ async def most_relevant(
             }
         )
 
-    results: list[MultipleChoiceResult] = []
+    # partitions are independent requests, so we submit them concurrently
+    coros = [
+        classifier(**{k: v for k, v in partition.items() if k not in ("idxs", "claims_sets")})
+        for partition in partitions
+    ]
+    partition_results = await asyncio.gather(*coros)
 
-    for partition in partitions:
+    # results are returned in the order of the arguments
+    results: list[MultipleChoiceResult] = [None] * len(inputs)  # type: ignore
 
-        classification_results = await classifier(**{k: v for k, v in partition.items() if k != "claims_sets"})  # type: ignore
+    for partition, classification_results in zip(partitions, partition_results):
 
         # postprocess
         cverb = partition["classes_verbalized"]
-        for cres, claims_set in zip(classification_results, partition["claims_sets"]):
+        for i, cres, claims_set in zip(partition["idxs"], classification_results, partition["claims_sets"]):
             if isinstance(cres, HfClassification):
-                choice_labels = [c.label for c in claims_set]  # original ordering of labels
-                probs = {label: cres.scores[cres.labels.index(label)] for label in cverb}
+                choice_idx = {c.label: j for j, c in enumerate(claims_set)}  # original ordering of labels
+                scores = dict(zip(cres.labels, cres.scores))
+                # probs are listed in the original ordering of claims, too, i.e. aligned with choices
+                probs = {claim.label: scores[claim.label] for claim in claims_set}
                 label_max = cres.labels[0]  # labels are sorted by score
-                idx_max = choice_labels.index(label_max)
+                idx_max = choice_idx[label_max]
                 result = MultipleChoiceResult(probs=probs, label_max=label_max, idx_max=idx_max, choices=claims_set)
-                results.append(result)
+                results[i] = result
             else:
                 # default result
                 logging.getLogger(__name__).warning(
                     f"Invalid classification result: {cres}. "
                     "Using uniform distribution for most_relevant prediction."
                 )
-                results.append(
-                    MultipleChoiceResult(
-                        probs={label: 1 / len(cverb) for label in cverb}, label_max=cverb[0], idx_max=0, choices=cverb
-                    )
+                results[i] = MultipleChoiceResult(
+                    probs={claim.label: 1 / len(cverb) for claim in claims_set},
+                    label_max=claims_set[0].label,
+                    idx_max=0,
+                    choices=claims_set,
                 )
 
     return results
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
 import signal
 import threading
@@ -68,6 +70,18 @@ class LCELAnalyst(AbstractArtifactAnalyst):
     def timeout(func):
         """Timeout decorator for LCELAnalyst methods."""
 
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                try:
+                    return await asyncio.wait_for(func(self, *args, **kwargs), timeout=self._lcel_query_timeout)
+                except (TimeoutError, asyncio.TimeoutError):
+                    logging.getLogger().warning("LCEL query %s timed out.", func.__name__)
+                    return None
+
+            return async_wrapper
+
         def _timeout_handler(signum, frame):  # noqa: ARG001
             msg = "LCEL query timed out."
             raise TimeoutError(msg)
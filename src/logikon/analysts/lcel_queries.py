@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+import warnings
 
 import logikon.schemas.argument_mapping as am
 from logikon.backends.chat_models_with_grammar import LogitsModel
 from logikon.backends.multiple_choice import MultipleChoiceResult, multiple_choice_query
 from logikon.schemas.pros_cons import Claim
 
+_CHOICE_LABELS = "ABCDEFGHIJ"  # labels for enumerated claims in multiple choice questions
+
 _SUPPORTS_Q_PROMPT = """
 Assignment: Determine whether an argument supports a claim.
 
@@ -118,6 +121,40 @@ So, given your thorough assessment, which is correct:
 
 Just answer with (A/B). You'll be asked to justify your answer later on."""
 
+_VALENCE_NEUTRAL_PROMPT = """
+Assignment: Identify whether a given consideration speaks for or against a claim, or is irrelevant to it.
+
+{issue_text}Read the consideration and claim carefully.
+
+<consideration>
+{argument_label}: {argument_text}
+</consideration>
+<claim>
+{claim_label}: {claim_text}
+</claim>
+
+Does the consideration speak for, or rather against the claim, or neither?
+
+Here is a simple heuristic that may help you to solve the task:
+Suppose that Bob, who is clear-thinking and fact-loving, is unsure about the claim "{claim_text}"
+Now, let's assume that Bob newly learns about and accepts the consideration "{argument_text}"
+Is this novel consideration rather going to:
+
+(A) strengthen Bob's belief in the claim.
+(B) weaken Bob's belief in the claim.
+(C) leave Bob's belief in the claim unaffected.
+
+In case (A), the consideration speaks for the claim; in case (B), it speaks against the claim;
+in case (C), it is irrelevant to the claim.
+
+So, given your thorough assessment, which is correct:
+
+(A) The consideration speaks for the claim.
+(B) The consideration speaks against the claim.
+(C) The consideration is irrelevant to the claim.
+
+Just answer with (A/B/C). You'll be asked to justify your answer later on."""
+
 
 async def supports_q(
     arguments: Claim | list[Claim], claims: Claim | list[Claim], model: LogitsModel
@@ -126,8 +163,13 @@ async def supports_q(
 
     Label A: The argument supports the claim
     Label B: The argument does not support the claim
+
+    Deprecated: use `valence(..., neutral=True)`, which assesses support, attack
+    and irrelevance in a single query.
     """
 
+    warnings.warn("supports_q is deprecated, use valence(..., neutral=True) instead.", DeprecationWarning, stacklevel=2)
+
     if isinstance(arguments, Claim):
         arguments = [arguments]
     if isinstance(claims, Claim):
@@ -157,6 +199,16 @@ async def supports_q(
 async def attacks_q(
     arguments: Claim | list[Claim], claims: Claim | list[Claim], model: LogitsModel
 ) -> list[MultipleChoiceResult]:
+    """Query attack with LCEL
+
+    Label A: The argument disconfirms the claim
+    Label B: The argument does not disconfirm the claim
+
+    Deprecated: use `valence(..., neutral=True)`, which assesses support, attack
+    and irrelevance in a single query.
+    """
+
+    warnings.warn("attacks_q is deprecated, use valence(..., neutral=True) instead.", DeprecationWarning, stacklevel=2)
 
     if isinstance(arguments, Claim):
         arguments = [arguments]
@@ -206,8 +258,8 @@ async def most_confirmed(
     labels_ = []
     choices_ = []
     for argument, claims_arg in zip(arguments, claims):
-        choices = claims_arg[:10]  # type: ignore
-        labels = [label for label in "ABCDEFGHIJ"][: len(choices)]  # noqa: C416
+        choices = claims_arg[: len(_CHOICE_LABELS)]  # type: ignore
+        labels = list(_CHOICE_LABELS[: len(choices)])
         labels_claims_list = "\n".join(
             [f"({label}) {claim.label}: {claim.text}" for label, claim in zip(labels, choices)]
         )
@@ -254,8 +306,8 @@ async def most_disconfirmed(
     choices_ = []
 
     for argument, claims_arg in zip(arguments, claims):
-        choices = claims_arg[:10]  # type: ignore
-        labels = [label for label in "ABCDEFGHIJ"][: len(choices)]  # noqa: C416
+        choices = claims_arg[: len(_CHOICE_LABELS)]  # type: ignore
+        labels = list(_CHOICE_LABELS[: len(choices)])
 
         def _to_lower(text: str):
             if text:
@@ -293,7 +345,12 @@ async def most_disconfirmed(
 
 
 async def valence(
-    arguments: Claim | list[Claim], claims: Claim | list[Claim], issue: str, model: LogitsModel
+    arguments: Claim | list[Claim],
+    claims: Claim | list[Claim],
+    issue: str,
+    model: LogitsModel,
+    *,
+    neutral: bool = False,
 ) -> list[MultipleChoiceResult]:
     """Query valence with LCEL
 
@@ -301,6 +358,9 @@ async def valence(
     explication of the reason relation as probabilistic relevance.
 
     W. Spohn, The Laws of Belief, OUP 2012, pp. 32ff.
+
+    If `neutral` is set, the query offers irrelevance (am.NEUTRAL) as third
+    choice, so that valence and strength of a relation are assessed at once.
     """
 
     if isinstance(arguments, Claim):
@@ -320,16 +380,25 @@ async def valence(
         if issue
         else ""
     )
-    labels = ["A", "B"]
-    choices = [am.SUPPORT, am.ATTACK]
-
+    if neutral:
+        prompt_template = _VALENCE_NEUTRAL_PROMPT
+        labels = ["A", "B", "C"]
+        choices = [am.SUPPORT, am.ATTACK, am.NEUTRAL]
+    else:
+        prompt_template = _VALENCE_PROMPT
+        labels = ["A", "B"]
+        choices = [am.SUPPORT, am.ATTACK]
+
+    # substitute call-invariant issue text once (escaping braces), and only per-pair fields in loop
+    prompt_template = prompt_template.replace("{issue_text}", issue_text.replace("{", "{{").replace("}", "}}"))
     questions = [
-        _VALENCE_PROMPT.format(
-            issue_text=issue_text,
-            argument_label=argument.label,
-            argument_text=argument.text,
-            claim_label=claim.label,
-            claim_text=claim.text,
+        prompt_template.format_map(
+            {
+                "argument_label": argument.label,
+                "argument_text": argument.text,
+                "claim_label": claim.label,
+                "claim_text": claim.text,
+            }
         )
         for argument, claim in zip(arguments, claims)
     ]
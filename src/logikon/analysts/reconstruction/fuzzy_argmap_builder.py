@@ -11,7 +11,6 @@ The analyst proceeds as follows:
 
 from __future__ import annotations
 
-import copy
 import uuid
 from typing import Any, ClassVar
 
@@ -47,20 +46,19 @@ class FuzzyArgMapBuilder(AbstractArtifactAnalyst):
         for u, v, data in relevance_network.edges(data=True):
             if "weight" not in data:
                 self.logger.warning(f"Missing weight in edge {u} -> {v}. Using default value: {_DEFAULT_WEIGHT}.")
-        for node, data in relevance_network.nodes.items():
+        root_nodes = []
+        for node, data in relevance_network.nodes(data=True):
             if "node_type" not in data:
                 msg = f"Invalid relevance graph data. Missing node_type in node {node}."
                 raise ValueError(msg)
-        root_nodes = [node for node, data in relevance_network.nodes.items() if data["node_type"] == am.CENTRAL_CLAIM]
+            if data["node_type"] == am.CENTRAL_CLAIM:
+                root_nodes.append(node)
         # check if there are any intra-root edges
+        root_set = set(root_nodes)
         for node1 in root_nodes:
-            for node2 in root_nodes:
-                if node1 == node2:
-                    continue
-                if relevance_network.has_edge(node1, node2) or relevance_network.has_edge(node2, node1):
-                    self.logger.warning(
-                        f"Relevance network already contains intra-root edge {node1} -> {node2} or {node2} -> {node1}."
-                    )
+            for node2 in relevance_network.successors(node1):
+                if node2 != node1 and node2 in root_set:
+                    self.logger.warning(f"Relevance network already contains intra-root edge {node1} -> {node2}.")
 
     def _preprocess_network(self, relevance_network: nx.DiGraph) -> nx.DiGraph:
         """preprocess relevance network,
@@ -75,7 +73,8 @@ class FuzzyArgMapBuilder(AbstractArtifactAnalyst):
         Returns:
             nx.DiGraph: relevance network with added intra-root edges
         """
-        G = copy.deepcopy(relevance_network)  # noqa: N806
+        # shallow copy suffices, as we only add pseudo nodes and edges
+        G = relevance_network.copy()  # noqa: N806
 
         root_nodes = [node for node, data in G.nodes.items() if data["node_type"] == am.CENTRAL_CLAIM]
 
@@ -84,19 +83,24 @@ class FuzzyArgMapBuilder(AbstractArtifactAnalyst):
         G.add_node(pseudo_root, node_type=am.CENTRAL_CLAIM, pseudo=True)
 
         # add pseudo edges
-        for node in root_nodes:
-            G.add_edge(node, pseudo_root, weight=_FIX_WEIGHT_INTRA_ROOTS, valence=am.SUPPORT, pseudo=True)
+        pseudo_edges = [
+            (node, pseudo_root, {"weight": _FIX_WEIGHT_INTRA_ROOTS, "valence": am.SUPPORT, "pseudo": True})
+            for node in root_nodes
+        ]
+        G.add_edges_from(pseudo_edges)
 
         # reverse edge direction (root_claims are technically sinks, not roots)
-        G = G.reverse(copy=True)  # noqa: N806
-
-        return G
+        # we return a read-only view rather than a reversed copy of the graph
+        return nx.reverse_view(G)
 
     def _post_process_fuzzy_argmap(self, fuzzy_argmap: nx.DiGraph, relevance_network: nx.DiGraph) -> nx.DiGraph:
-        """remove pseudo nodes and edges from fuzzy argmap, and undo edge reversal (inplace)
+        """remove pseudo nodes and edges from fuzzy argmap, and undo edge reversal
 
         Args:
             fuzzy_argmap (nx.DiGraph): _description_
+
+        Returns:
+            nx.DiGraph: new graph without pseudo entities and with original edge direction
         """
         G = fuzzy_argmap  # noqa: N806
 
@@ -105,21 +109,20 @@ class FuzzyArgMapBuilder(AbstractArtifactAnalyst):
             if G.has_node(node):
                 G.add_node(node, **data)
 
-        # remove pseudo entities
-        pseudo_edges = [(u, v) for u, v, data in G.edges(data=True) if data.get("pseudo", False)]
-        for u, v in pseudo_edges:
-            G.remove_edge(u, v)
-
-        pseudo_nodes = [node for node, data in G.nodes.items() if data.get("pseudo", False)]
+        pseudo_nodes = {node for node, data in G.nodes.items() if data.get("pseudo", False)}
         if not pseudo_nodes:
             self.logger.warning("No pseudo nodes found while postprocessing fuzzy argmap.")
-        for node in pseudo_nodes:
-            G.remove_node(node)
 
-        # reverse edges
-        G = G.reverse(copy=True)  # noqa: N806
+        # build graph without pseudo entities, reversing edges on the fly
+        H = nx.DiGraph()  # noqa: N806
+        H.add_nodes_from((node, data) for node, data in G.nodes.items() if node not in pseudo_nodes)
+        H.add_edges_from(
+            (v, u, data)
+            for u, v, data in G.edges(data=True)
+            if not data.get("pseudo", False) and u not in pseudo_nodes and v not in pseudo_nodes
+        )
 
-        return G
+        return H
 
     def _add_above_threshold_edges(
         self, fuzzy_argmap: nx.DiGraph, relevance_network: nx.DiGraph
@@ -134,7 +137,7 @@ class FuzzyArgMapBuilder(AbstractArtifactAnalyst):
             adges_added (list[str]): list of edges that were added to fuzzy argmap
         """
 
-        is_forest = nx.is_forest(fuzzy_argmap.reverse())
+        is_forest = nx.is_forest(fuzzy_argmap.reverse(copy=False))
         if is_forest:
             nx.set_edge_attributes(fuzzy_argmap, True, am.IN_FOREST)
         else:
@@ -160,23 +163,39 @@ class FuzzyArgMapBuilder(AbstractArtifactAnalyst):
         if thrsh_support_w is None and thrsh_attack_w is None:
             return []
 
+        # select candidate edges with weight above threshold in one vectorized pass
+        edges = list(relevance_network.edges(data=True))
+        weights = np.array([data.get("weight", _DEFAULT_WEIGHT) for _, _, data in edges], dtype=float)
+        valences = np.array([data.get("valence") for _, _, data in edges], dtype=object)
+        above_threshold = np.zeros(len(edges), dtype=bool)
+        if thrsh_support_w is not None:
+            above_threshold |= (valences == am.SUPPORT) & (weights > thrsh_support_w)
+        if thrsh_attack_w is not None:
+            above_threshold |= (valences == am.ATTACK) & (weights > thrsh_attack_w)
+
+        new_edges = []
         edges_added = []
+        # edges are added in one batch below, so we keep track of pending edges and in-degrees
+        pending = set()
+        pending_in_degree: dict[Any, int] = {}
 
         # TODO: if there are more than _MAX_OUT_DEGREE outgoing edges from a node,
         # we should only add the _MAX_OUT_DEGREE edges with the highest weights
-        for u, v, edgedata in relevance_network.edges(data=True):
-            if fuzzy_argmap.has_edge(u, v) or fuzzy_argmap.has_edge(v, u):
+        for idx in np.flatnonzero(above_threshold):
+            u, v, edgedata = edges[idx]
+            if fuzzy_argmap.has_edge(u, v) or fuzzy_argmap.has_edge(v, u) or (v, u) in pending:
                 continue
             # check out-degree / we're use in-degree as we're operating on the reversed graph!
-            if fuzzy_argmap.in_degree(u) >= _MAX_OUT_DEGREE:
+            if fuzzy_argmap.in_degree(u) + pending_in_degree.get(u, 0) >= _MAX_OUT_DEGREE:
                 continue
             data = {**edgedata, am.IN_FOREST: False} if is_forest else edgedata
-            if data["valence"] == am.SUPPORT and thrsh_support_w is not None and data["weight"] > thrsh_support_w:
-                fuzzy_argmap.add_edge(u, v, **data)
-            elif data["valence"] == am.ATTACK and thrsh_attack_w is not None and data["weight"] > thrsh_attack_w:
-                fuzzy_argmap.add_edge(u, v, **data)
+            new_edges.append((u, v, data))
+            pending.add((u, v))
+            pending_in_degree[v] = pending_in_degree.get(v, 0) + 1
             edges_added.append((u, v))
 
+        fuzzy_argmap.add_edges_from(new_edges)
+
         self.logger.debug(f"Added {len(edges_added)} edges to fuzzy argmap.")
 
         return edges_added
@@ -29,13 +29,16 @@ flowchart TD
 from __future__ import annotations
 
 import re
-from typing import Any, Sequence
+from dataclasses import dataclass
+from typing import Sequence
 
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_core.output_parsers import StrOutputParser
+from langchain_core.output_parsers import SimpleJsonOutputParser, StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
 from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, Field
 
+from logikon.analysts.base import TEXT_PREFIX_PROMPT
 from logikon.analysts.lcel_analyst import LCELAnalyst
 from logikon.schemas.results import AnalysisState, Artifact
 
@@ -48,24 +51,95 @@ QUESTIONS_EVAL = [
     "Which alternative is most faithful to the text?",
 ]
 
+# Drafting and rating prompts start with the same text block, so that
+# backends with prefix caching prefill the (long) text only once.
+_PROMPT_TEXT = TEXT_PREFIX_PROMPT
+
+_PROMPT_KEY_ISSUE = (
+    _PROMPT_TEXT + "Assignment: Analyse and reconstruct the text's argumentation.\n\n"
+    "The argumentative analysis proceeds in three steps:\n\n"
+    "Step 1. Identify central issue\n"
+    "Step 2. Identify key claims discussed\n"
+    "Step 3. Set up a pros & cons list\n\n"
+    "**Step 1**\n\n"
+    "State the central issue / decision problem discussed in the TEXT in a few words.\n"
+    "Be as brief and concise as possible. Think of your answer as the headline of an argument or debate.\n"
+)
+
+_LAST_SENTENCE_END = re.compile(r".*[.!?]", re.DOTALL)  # text up to and including last sentence end
+_NON_WORD = re.compile(r"\W+")
+
 # examples
 # - NONE
 
 
+@dataclass(slots=True)
+class Draft:
+    """Issue draft with its label in the rating dialogue."""
+
+    text: str
+    label: str
+
+
+class Issue(BaseModel):
+    """JSON schema for issue drafts."""
+
+    issue: str = Field(min_length=1, max_length=MAX_LEN_ISSUE)
+
+
+_ISSUE_JSON_SCHEMA = Issue.model_json_schema()
+
+# prompt templates are built once at import time and shared by all analyst instances
+_PROMPT_TEMPLATE_ISSUE_JSON = ChatPromptTemplate.from_template(
+    _PROMPT_KEY_ISSUE + "Return your answer as a JSON object with a single key \"issue\"."  # noqa: Q003
+)
+_PROMPT_TEMPLATE_ISSUE_TAGS = ChatPromptTemplate.from_template(
+    _PROMPT_KEY_ISSUE + "Enclose your answer in \"<ISSUE>\" / \"</ISSUE>\" tags."  # noqa: Q003
+)
+_INIT_MESSAGE_RATING = HumanMessagePromptTemplate.from_template(
+    _PROMPT_TEXT + "Assignment: Rate different summarizations of the text's key issue.\n\n"
+    "Consider the following alternatives, which attempt to summarize the central "
+    "issue / basic decision discussed in the TEXT in a single sentence.\n\n"
+    "<ALTERNATIVES>\n"
+    "{formatted_alternatives}\n"
+    "</ALTERNATIVES>\n\n"
+    "I'll ask you to compare and evaluate these alternatives according to different "
+    "criteria, which I'll put as a question each. In the end, I'll ask you aggregate your "
+    "assessment. Understood?"
+)
+_PROMPT_TEMPLATE_RATING = ChatPromptTemplate.from_messages(
+    [
+        _INIT_MESSAGE_RATING,
+        AIMessage(content="Understood. Can you please ask the questions?"),
+        HumanMessagePromptTemplate.from_template(
+            "{formatted_questions}\n"
+            "(At this point, just answer each question with {formatted_labels}, "
+            "separating your answers by commas; you'll be asked to explain your answers later.)"
+        ),
+    ]
+)
+
+
 def _strip_issue_tag(text: str) -> str:
     """Postprocessing function
-    Strip issue tags from generated text.
+    Strip issue tags from generated text and drop incomplete trailing sentence.
     """
-    text = text.strip("\n ")
-    if text.startswith("<ISSUE>"):
-        text = text[len("<ISSUE>") :].strip("\n ")
-    if text.endswith("</ISSUE>"):
-        text = text[: -len("</ISSUE>")].strip("\n ")
-    if text[-1] not in [".", "!", "?"]:
-        # split text at any of ".", "!", "?"
-        splits = re.split(r"([.!?])", text)
-        text = "".join(splits[:-1]) if len(splits) > 1 else text
-    return text
+    text = text.strip("\n ").removeprefix("<ISSUE>").strip("\n ")
+    text = text.removesuffix("</ISSUE>").strip("\n ")
+    match = _LAST_SENTENCE_END.match(text)
+    return match.group(0) if match else text
+
+
+def _parse_issue(data: dict) -> str:
+    """Postprocessing function
+    Validate parsed json output, raises if issue is missing so that fallback chain takes over.
+    """
+    return Issue.model_validate(data).issue
+
+
+def _normalize_issue(text: str) -> str:
+    """Normalizes issue text for detecting (near-)duplicate drafts."""
+    return _NON_WORD.sub(" ", text).lower().strip()
 
 
 class IssueBuilderLCEL(LCELAnalyst):
@@ -77,28 +151,20 @@ class IssueBuilderLCEL(LCELAnalyst):
     __pdescription__ = "Issue or decision problem addressed in the deliberation"
     __product__ = "issue"
 
-    def _key_issue(self, prompt: str, completion: str) -> list[dict[str, Any]]:
+    async def _key_issue(self, prompt: str, completion: str) -> list[Draft]:
         """Defines and executes LCEL chain for generating issue drafts."""
 
-        prompt_template = ChatPromptTemplate.from_template(
-            "Assignment: Analyse and reconstruct a text's argumentation.\n\n"
-            "The argumentative analysis proceeds in three steps:\n\n"
-            "Step 1. Identify central issue\n"
-            "Step 2. Identify key claims discussed\n"
-            "Step 3. Set up a pros & cons list\n\n"
-            "Before we start, let's study the text to-be-analysed carefully.\n\n"
-            "<TEXT>\n"
-            "{prompt}{completion}\n"
-            "</TEXT>\n\n"
-            "**Step 1**\n\n"
-            "State the central issue / decision problem discussed in the TEXT in a few words.\n"
-            "Be as brief and concise as possible. Think of your answer as the headline of an argument or debate.\n"
-            "Enclose your answer in \"<ISSUE>\" / \"</ISSUE>\" tags."  # noqa: Q003
-        )
+        # json mode: issue is returned as {"issue": "..."}
+        gen_args_json = {
+            "temperature": 0.5,
+            "json_schema": _ISSUE_JSON_SCHEMA,
+        }
+
+        # fallback for backends without json mode: issue enclosed in tags
         regex = r"<ISSUE>[^\n]{1,%s}</ISSUE>" % MAX_LEN_ISSUE
         bnf = 'root  ::= "<ISSUE>" issue "</ISSUE>"\nissue ::= [^\n]+'
-        stop = ["</ISSUE>"]
-        gen_args = {
+        stop = ["</"]  # stop at start of closing tag rather than after emitting it in full
+        gen_args_tags = {
             "temperature": 0.5,
             "stop": stop,
             "bnf": bnf,
@@ -106,12 +172,19 @@ class IssueBuilderLCEL(LCELAnalyst):
         }
 
         # fmt: off
-        chain = (
-            prompt_template
-            | self._model.bind(**gen_args).with_retry()
+        chain_json = (
+            _PROMPT_TEMPLATE_ISSUE_JSON
+            | self._model.bind(**gen_args_json).with_retry()
+            | SimpleJsonOutputParser()
+            | RunnableLambda(_parse_issue)
+        )
+        chain_tags = (
+            _PROMPT_TEMPLATE_ISSUE_TAGS
+            | self._model.bind(**gen_args_tags).with_retry()
             | StrOutputParser()
             | RunnableLambda(_strip_issue_tag)
         )
+        chain = chain_json.with_fallbacks([chain_tags])
         # fmt: on
 
         inputs = {
@@ -119,19 +192,13 @@ class IssueBuilderLCEL(LCELAnalyst):
             "completion": completion,
         }
 
-        results = chain.batch(N_DRAFTS * [inputs])
+        results = await chain.abatch(N_DRAFTS * [inputs])
 
-        issue_drafts = [
-            {
-                "text": result,
-                "label": LABELS[enum],
-            }
-            for enum, result in enumerate(results)
-        ]
+        issue_drafts = [Draft(text=result, label=LABELS[enum]) for enum, result in enumerate(results)]
         return issue_drafts
 
-    def _rate_issue_drafts(
-        self, alternatives: list[dict[str, Any]], questions: list[str], prompt: str, completion: str
+    async def _rate_issue_drafts(
+        self, alternatives: list[Draft], questions: list[str], prompt: str, completion: str
     ) -> str | None:
         """Rates and selects alternative issue drafts according to criteria (questions).
 
@@ -139,70 +206,53 @@ class IssueBuilderLCEL(LCELAnalyst):
             str: label of best alternative
         """
 
-        init_message = HumanMessagePromptTemplate.from_template(
-            "Assignment: Rate different summarizations of a text's key issue.\n\n"
-            "Before we start, let's study the text to-be-analysed carefully.\n\n"
-            "<TEXT>\n"
-            "{prompt}{completion}\n"
-            "</TEXT>\n\n"
-            "Consider the following alternatives, which attempt to summarize the central "
-            "issue / basic decision discussed in the TEXT in a single sentence.\n\n"
-            "<ALTERNATIVES>\n"
-            "{formatted_alternatives}\n"
-            "</ALTERNATIVES>\n\n"
-            "I'll ask you to compare and evaluate these alternatives according to different "
-            "criteria, which I'll put as a question each. In the end, I'll ask you aggregate your "
-            "assessment. Understood?"
-        )
+        # Step 1 Dialogue: all questions are answered in a single constrained completion
 
-        # Step 1 Dialogue
-
-        prompt_template = ChatPromptTemplate.from_messages(
-            [
-                init_message,
-                AIMessage(content="Understood. Can you please ask the first question?"),
-                HumanMessagePromptTemplate.from_template(
-                    "Q: {question}\n"
-                    "(At this point, just answer each question with {formatted_labels}; "
-                    "you'll be asked to explain your answers later.)"
-                ),
-            ]
-        )
-
-        labels = [alternative["label"] for alternative in alternatives]
+        labels = [alternative.label for alternative in alternatives]
         formatted_alternatives = "\n".join(
-            f"({alternative['label']}) \"{alternative['text']}\"" for alternative in alternatives
+            f'({alternative.label}) "{alternative.text}"' for alternative in alternatives
         )
         formatted_labels = "/".join(labels)
+        formatted_questions = "\n".join(f"Q{enum + 1}: {question}" for enum, question in enumerate(questions))
 
         regex = "(" + "|".join(labels) + ")"
         bnf = "root ::= ({labels_bnf})".format(labels_bnf="|".join([f'"{label}"' for label in labels]))
         gen_args = {"temperature": 1.0, "regex": regex, "bnf": bnf}
+        gen_args_answers = {
+            "temperature": 1.0,
+            "regex": ",".join(len(questions) * [regex]),
+            "bnf": "root ::= {answers}\nanswer ::= ({labels_bnf})".format(
+                answers=' "," '.join(len(questions) * ["answer"]),
+                labels_bnf="|".join([f'"{label}"' for label in labels]),
+            ),
+        }
 
         # fmt: off
         chain = (
-            prompt_template
-            | self._model.bind(**gen_args).with_retry()
+            _PROMPT_TEMPLATE_RATING
+            | self._model.bind(**gen_args_answers).with_retry()
             | StrOutputParser()
         )
         # fmt: on
 
-        inputs1 = [
-            {
-                "prompt": prompt,
-                "completion": completion,
-                "formatted_alternatives": formatted_alternatives,
-                "formatted_labels": formatted_labels,
-                "question": question,
-            }
-            for question in questions
-        ]
+        inputs1 = {
+            "prompt": prompt,
+            "completion": completion,
+            "formatted_alternatives": formatted_alternatives,
+            "formatted_labels": formatted_labels,
+            "formatted_questions": formatted_questions,
+        }
 
-        results = chain.batch(inputs1)
+        result = await chain.ainvoke(inputs1)
+        results = [answer.strip() for answer in result.split(",")]
+        if len(results) != len(questions) or any(answer not in labels for answer in results):
+            # backend didn't comply with regex / grammar
+            self.logger.warning("Failed to parse answers to rating questions: %r", result)
+            return None
 
         # Step 2 Dialogue
 
-        messages: Sequence = [init_message, AIMessage(content="Understood. Let's start.")]
+        messages: Sequence = [_INIT_MESSAGE_RATING, AIMessage(content="Understood. Let's start.")]
         for question, answer in zip(questions, results):
             messages = [*messages, HumanMessage(content=f"{question}"), AIMessage(content=f"{answer}")]
         messages = [
@@ -229,7 +279,7 @@ class IssueBuilderLCEL(LCELAnalyst):
             "formatted_labels": formatted_labels,
         }
 
-        result = chain.invoke(inputs2)
+        result = await chain.ainvoke(inputs2)
 
         return result
 
@@ -242,25 +292,33 @@ class IssueBuilderLCEL(LCELAnalyst):
             raise ValueError(msg)
 
         # draft summarizations
-        issue_drafts = self._key_issue(
-            prompt=prompt,
-            completion=completion,
-        )
-        self.logger.debug(f"Drafts: {issue_drafts}")
-
-        # rate summarizations and choose best
-        label = self._rate_issue_drafts(
-            alternatives=issue_drafts,
-            questions=QUESTIONS_EVAL,
+        issue_drafts = await self._key_issue(
             prompt=prompt,
             completion=completion,
         )
-        issue = next((draft["text"] for draft in issue_drafts if draft["label"] == label), None)
+        drafts_by_label = {draft.label: draft.text for draft in issue_drafts}
+        self.logger.debug(f"Drafts: {drafts_by_label}")
+
+        unique_drafts: dict[str, Draft] = {}
+        for draft in issue_drafts:
+            unique_drafts.setdefault(_normalize_issue(draft.text), draft)
+        if len(unique_drafts) == 1:
+            # nothing to choose from, skip rating
+            issue = issue_drafts[0].text
+        else:
+            # rate summarizations and choose best
+            label = await self._rate_issue_drafts(
+                alternatives=list(unique_drafts.values()),
+                questions=QUESTIONS_EVAL,
+                prompt=prompt,
+                completion=completion,
+            )
+            issue = drafts_by_label.get(label) if label is not None else None
 
         if issue is None:
             if issue_drafts:
                 self.logger.warning("Failed to rate issue drafts, picking first alternative.")
-                issue = issue_drafts[0]["text"]
+                issue = issue_drafts[0].text
             else:
                 self.logger.warning("Failed to elicit issue (issue is None).")
 
@@ -35,27 +35,34 @@ flowchart TD
 from __future__ import annotations
 
 import asyncio
-import copy
 import json
-import pprint
+import logging
 import random
 import re
-from typing import ClassVar, TypedDict
-
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain, repeat
+from typing import ClassVar
+
+import numpy as np
+from langchain_core.caches import InMemoryCache
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import SimpleJsonOutputParser, StrOutputParser
 from langchain_core.prompts import AIMessagePromptTemplate, ChatPromptTemplate, HumanMessagePromptTemplate
 from langchain_core.prompts.chat import MessageLikeRepresentation
 from langchain_core.runnables import RunnableLambda
-from pydantic import BaseModel, RootModel
+from pydantic import BaseModel, RootModel, TypeAdapter
 
 import logikon.schemas.argument_mapping as am
 from logikon.analysts import classifier_queries, lcel_queries
-from logikon.analysts.base import SYSTEM_MESSAGE_PROMPT
-from logikon.analysts.lcel_analyst import LCELAnalyst
+from logikon.analysts.base import SYSTEM_MESSAGE_PROMPT, TEXT_PREFIX_PROMPT, ArtifcatAnalystConfig
+from logikon.analysts.lcel_analyst import LCELAnalyst, LCELAnalystConfig
+from logikon.backends.multiple_choice import MultipleChoiceResult
 from logikon.schemas.pros_cons import Claim, ClaimList, ProsConsList, RootClaim
 from logikon.schemas.results import AnalysisState, Artifact
 from logikon.utils import argdown
+from logikon.utils.memo import BoundedMemo
 
 MAX_N_REASONS = 18
 MAX_N_ROOTS = 10
@@ -64,6 +71,7 @@ MAX_LEN_ROOTCLAIM = 128
 _MAX_LEN_GIST = 180
 N_DRAFTS = 3
 LABELS = "ABCDEFG"
+MAX_PROBE_CACHE_SIZE = 1024  # max number of memoized probe results per analyst
 
 ### CONSTRAINTS ###
 
@@ -138,47 +146,60 @@ EXAMPLES_ISSUE_PROSCONS = [
 
 ### FORMATTERS ###
 
+_SENTENCE_END = frozenset(".!?")
+_SENTENCE_SPLIT = re.compile(r"([.!?])")
+_CLAIM_LIST_ADAPTER = TypeAdapter(list[Claim])
+
 
 def trunk_to_sentence(text: str) -> str:
     """Truncates text by cutting off incomplete sentences."""
     text = text.strip(" '\n")
-    if text and text[-1] not in [".", "!", "?"]:
+    if text and text[-1] not in _SENTENCE_END:
         # remove preceding marks
         text = text.strip(".!? ")
         # split text at any of ".", "!", "?"
-        splits = re.split(r"([.!?])", text)
+        splits = _SENTENCE_SPLIT.split(text)
         text = "".join(splits[:-1]) if len(splits) > 1 else text
     return text
 
 
 def format_reasons(reasons: list[Claim]) -> str:
     """Dump reasons as valid json string"""
-    reasons_data = [r.model_dump() for r in reasons]
-    formatted = json.dumps(reasons_data, indent=4)
+    formatted = _CLAIM_LIST_ADAPTER.dump_json(reasons, indent=4).decode()
     return formatted
 
 
+@lru_cache(maxsize=64)
+def _sample_indices(n: int) -> tuple[int, ...]:
+    """Deterministic sample of (at most MAX_N_REASONS) indices from range(n).
+
+    Same selection as `random.Random(42).sample(seq, min(n, MAX_N_REASONS))` for any sequence of length n.
+    """
+    return tuple(random.Random(42).sample(range(n), min(n, MAX_N_REASONS)))
+
+
 def format_proscons(issue: str, proscons: ProsConsList, extra_reasons: list | None = None) -> str:
-    formatted = ""
-    # reasons block
-    formatted += "reasons:\n"
-    if not extra_reasons:
-        reasons = []
-    else:
-        reasons = copy.deepcopy(extra_reasons)
+    reasons = list(extra_reasons) if extra_reasons else []
     for root in proscons.roots:
         reasons.extend(root.pros)
         reasons.extend(root.cons)
-    reasons = random.Random(42).sample(reasons, min(len(reasons), MAX_N_REASONS))
-    formatted += f"{format_reasons(reasons)}\n"
-    # issue
-    formatted += f'issue: "{issue}"\n'
-    # pros and cons block
-    formatted += "pros_and_cons:\n"
-    formatted += argdown.format_proscons(proscons)
+    # sort before sampling, so that the same reasons are always rendered in the same order
+    reasons.sort(key=lambda reason: (reason.label, reason.text))
+    reasons = [reasons[idx] for idx in _sample_indices(len(reasons))]
+    # reasons block, issue, pros and cons block
+    formatted = "".join(
+        [
+            "reasons:\n",
+            f"{format_reasons(reasons)}\n",
+            f'issue: "{issue}"\n',
+            "pros_and_cons:\n",
+            argdown.format_proscons(proscons),
+        ]
+    )
     return formatted
 
 
+@lru_cache(maxsize=1)
 def format_examples() -> str:
     formatted = [format_proscons(*example) for example in EXAMPLES_ISSUE_PROSCONS]
     formatted = ["<example>\n" + example + "\n</example>" for example in formatted]
@@ -187,7 +208,12 @@ def format_examples() -> str:
 
 
 def format_options(options: list[str]) -> str:
-    formatted = json.dumps(options)
+    return _format_options_cached(tuple(options))
+
+
+@lru_cache(maxsize=32)
+def _format_options_cached(options: tuple[str, ...]) -> str:
+    formatted = json.dumps(list(options))
     return formatted
 
 
@@ -196,15 +222,95 @@ def format_critique(critique: list[str]) -> str:
     return "\n".join(formatted)
 
 
-### PROMPT TEMPLATES ###
+def _count_used_reasons(pros_and_cons: ProsConsList, reasons: list[Claim]) -> int:
+    """Counts how many of the given reasons figure (by label) in the pros and cons list."""
+    used_labels = {reason.label for root in pros_and_cons.roots for reason in root.pros + root.cons}
+    return sum(reason.label in used_labels for reason in reasons)
+
+
+def _trivial_pros_and_cons(reasons: list[Claim], issue: str, options: list[str]) -> ProsConsList:
+    """Builds pros and cons list with a single root claim (first option or issue) supported by all reasons."""
+    root_text = options[0] if options else issue
+    root_label = options[0] if options else "Main"
+    root = RootClaim(label=root_label[:MAX_LEN_TITLE], text=root_text[:MAX_LEN_ROOTCLAIM], pros=reasons, cons=[])
+    return ProsConsList(roots=[root], options=options)
+
+
+### REVISIONS ###
+
+
+@dataclass(slots=True)
+class Revision:
+    """Instruction to move a reason to another root claim (given by index) with a possibly different valence."""
+
+    reason: Claim
+    old_target_idx: int
+    old_val: str
+    new_target_idx: int
+    new_val: str
+
+
+def _apply_revisions(pros_and_cons: ProsConsList, revisions: list[Revision]) -> None:
+    """Moves reasons between root claims of pros and cons list (in place) according to revisions."""
+
+    # ids of reasons to remove, per (root index, valence)
+    to_remove: dict[tuple[int, str], set[int]] = defaultdict(set)
+    for revision in revisions:
+        to_remove[(revision.old_target_idx, revision.old_val)].add(id(revision.reason))
+
+    for enum, root in enumerate(pros_and_cons.roots):
+        if (enum, am.SUPPORT) in to_remove:
+            removed = to_remove[(enum, am.SUPPORT)]
+            root.pros = [pro for pro in root.pros if id(pro) not in removed]
+        if (enum, am.ATTACK) in to_remove:
+            removed = to_remove[(enum, am.ATTACK)]
+            root.cons = [con for con in root.cons if id(con) not in removed]
+
+    for revision in revisions:
+        new_root = pros_and_cons.roots[revision.new_target_idx]
+        if revision.new_val == am.SUPPORT:
+            new_root.pros.append(revision.reason)
+        elif revision.new_val == am.ATTACK:
+            new_root.cons.append(revision.reason)
+
+
+def _off_target(results: dict[Claim, MultipleChoiceResult], reasons_by_root: list[list[Claim]]) -> list[list[bool]]:
+    """Checks for all reasons at once whether some root claim is at least twice as
+    probable as the reason's current target (given by its position in `reasons_by_root`).
+
+    Returns:
+        list[list[bool]]: check results, shaped like `reasons_by_root`
+    """
+    reasons = [reason for root_reasons in reasons_by_root for reason in root_reasons]
+    if not reasons:
+        return [[] for _ in reasons_by_root]
+    target_idxs = [enum for enum, root_reasons in enumerate(reasons_by_root) for _ in root_reasons]
+    probs = np.array([list(results[reason].probs.values()) for reason in reasons], dtype=float)
+    mask = probs.max(axis=1) >= 2 * probs[np.arange(len(reasons)), target_idxs]
+    mask_iter = iter(mask.tolist())
+    return [[next(mask_iter) for _ in root_reasons] for root_reasons in reasons_by_root]
+
+
+### SCHEMAS ###
+
+
+class _Option(BaseModel):
+    option: str
+
+
+class _OptionList(RootModel):
+    root: list[_Option]
 
-_PROMPT_MINE_REASONS = """Your Assignment: Summarize all the arguments (pros and cons) presented in a text.
 
-Use the following inputs (a TEXT that addresses an ISSUE) to solve your assignment.
+_CLAIM_LIST_SCHEMA = ClaimList.model_json_schema()
+_OPTION_LIST_SCHEMA = _OptionList.model_json_schema()
 
-<TEXT>
-{prompt}{completion}
-</TEXT>
+
+### PROMPT TEMPLATES ###
+
+_PROMPT_MINE_REASONS_ASSIGNMENT = """Your Assignment: Summarize all the arguments (pros and cons) presented in the TEXT.
+
+Use the TEXT and the following ISSUE it addresses to solve your assignment.
 
 <ISSUE>
 {issue}
@@ -235,6 +341,9 @@ Let me give you more detailed instructions:
 - You don't have to distinguish between pro and con arguments.
 - IMPORTANT: Stay faithful to the text! Don't invent your own reasons. Only provide reasons which are either presented or discussed in the text."""  # noqa: E501
 
+# starts with the text block shared by all analysts, see TEXT_PREFIX_PROMPT
+_PROMPT_MINE_REASONS = TEXT_PREFIX_PROMPT + _PROMPT_MINE_REASONS_ASSIGNMENT
+
 _DUMMY_CLAIM_LABEL = "Dummy claim label (remove or replace)"
 _DUMMY_CLAIM_TEXT = "Dummy claim text (remove or replace)."
 
@@ -292,6 +401,71 @@ _MESSAGES_PROS_CONS_PREAMBLE: list[MessageLikeRepresentation] = [
     HumanMessage(content=("Correct. Now, let's start organizing the reasons into a pros and cons list.")),
 ]
 
+# prompt templates are built once at import time
+
+_MINE_REASONS_PROMPT = ChatPromptTemplate.from_template(_PROMPT_MINE_REASONS)
+
+_DESCRIBE_OPTIONS_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        HumanMessage(
+            content=(
+                "Assignment: Build a pros & cons list for a given issue.\n\n"
+                "**Plan**\n"
+                "Step 1: State the central issue.\n"
+                "Step 2: Identify the basic options available to an agent who faces the issue.\n"
+                "Step 3: Construct a pros & cons list for the issue.\n\n"
+                "**Step 1**\n"
+                "Let's begin by stating our central issue clearly and concisely:"
+            )
+        ),
+        AIMessagePromptTemplate.from_template('{{"issue"="{issue}"}}'),
+        HumanMessagePromptTemplate.from_template(
+            "**Step 2**\n"
+            "What are the basic options available to an agent who needs to address the above issue?\n"
+            "You may use any hints from the following text, but you don't have to.\n"
+            "<text>\n{prompt}\n</text>\n"
+            "Keep your answer short: Sketch each option in 2-6 words only. Prefer imperative mood. "
+            "Format your answer as valid JSON (i.e., `[{{'option': '...'}}, {{'option': '...'}}, ...]`)."
+        ),
+    ]
+)
+
+_PROS_CONS_PREAMBLE_PROMPT = ChatPromptTemplate.from_messages(_MESSAGES_PROS_CONS_PREAMBLE)
+
+_PROS_CONS_REVISE_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        *_MESSAGES_PROS_CONS_PREAMBLE,
+        AIMessagePromptTemplate.from_template("{formatted_proscons}"),
+        HumanMessagePromptTemplate.from_template(
+            "Thanks for the pros and cons list. However, I've noticed the following flaws:\n"
+            "{formatted_critique}\n"
+            "Can you please carefully re-read the above instructions, check the pros & cons list you've "
+            "provided, and correct the errors I pointed out? Please do so by producing a revised pros & "
+            "cons list below."
+        ),
+    ]
+)
+
+
+class ProsConsBuilderConfig(LCELAnalystConfig):
+    """ProsConsBuilderConfig
+
+    Configuration for ProsConsBuilder.
+
+    The pros and cons list is drafted N_DRAFTS times (i.e., with N_DRAFTS LLM queries), and the draft
+    that uses most reasons is kept.
+
+    Fields:
+        cache_llm_responses (bool): cache LLM responses in memory, keyed on prompt messages and generation args;
+            note that identical queries then yield identical responses irrespective of temperature, which is
+            why the pros and cons list is drafted only once if the cache is enabled
+        build_trivial_proscons (bool): build pros and cons list with a single root claim for less than two reasons
+            without querying the LLM (opt-in)
+    """
+
+    cache_llm_responses: bool = False
+    build_trivial_proscons: bool = False
+
 
 class ProsConsBuilderLCEL(LCELAnalyst):
     """ProsConsBuilderLCEL
@@ -303,19 +477,30 @@ class ProsConsBuilderLCEL(LCELAnalyst):
     __pdescription__ = "Pros and cons list with multiple root claims"
     __product__ = "proscons"
     __requirements__: ClassVar[list[str | set]] = ["issue"]
+    __configclass__: type[ArtifcatAnalystConfig] = ProsConsBuilderConfig
+
+    def __init__(self, config: ProsConsBuilderConfig):
+        super().__init__(config)
+        self._build_trivial_proscons = config.build_trivial_proscons
+        self._cache_llm_responses = config.cache_llm_responses
+        if config.cache_llm_responses:
+            # exact-match cache, e.g. for repeated revision prompts and test runs
+            self._model.cache = InMemoryCache()
+        # memoized (most confirmed, most disconfirmed) probe results, keyed by (use_classifier, reason, root claims),
+        # least recently used entries are evicted first
+        self._probe_cache: BoundedMemo[
+            tuple[bool, Claim, tuple[Claim, ...]], tuple[MultipleChoiceResult, MultipleChoiceResult]
+        ] = BoundedMemo(maxsize=MAX_PROBE_CACHE_SIZE)
 
     @LCELAnalyst.timeout
-    def _mine_reasons(self, prompt, completion, issue) -> list[Claim]:
+    async def _mine_reasons(self, prompt, completion, issue) -> list[Claim]:
         """Defines and executes LCEL chain for mining reasons (not distinguishing pros and cons)."""
 
-        prompt = ChatPromptTemplate.from_template(_PROMPT_MINE_REASONS)
-
-        guided_json = ClaimList.model_json_schema()
-        gen_args = {"temperature": 0.4, "json_schema": guided_json}
+        gen_args = {"temperature": 0.4, "json_schema": _CLAIM_LIST_SCHEMA}
 
         # fmt: off
         chain = (
-            prompt
+            _MINE_REASONS_PROMPT
             | self._model.bind(**gen_args).with_retry()
             | SimpleJsonOutputParser()
         )
@@ -328,92 +513,58 @@ class ProsConsBuilderLCEL(LCELAnalyst):
             "max_len_gist": _MAX_LEN_GIST,
         }
 
-        result = chain.invoke(inputs)
+        result = await chain.ainvoke(inputs)
 
         # postprocess reasons
         reasons = []
         for data in result:
             if not data:
                 continue
-            if "label" in data:
-                label = data["label"].strip(' "\n')
-            else:
-                self.logger.debug(f"Mine reasons results: {result}")
-                self.logger.warning(f"No label in claim item {data}. Using dummy.")
-                label = _DUMMY_CLAIM_LABEL
-            if "text" in data:
-                text = trunk_to_sentence(data["text"].strip(' "\n'))
-            else:
-                self.logger.debug(f"Mine reasons results: {result}")
-                self.logger.warning(f"No text in claim item {data}. Using dummy.")
-                text = _DUMMY_CLAIM_TEXT
+            label = data.get("label")
+            text = data.get("text")
+            if label is None or text is None:
+                self.logger.debug("Mine reasons results: %s", result)
+                self.logger.warning(f"No label or text in claim item {data}. Using dummy.")
+            label = _DUMMY_CLAIM_LABEL if label is None else label.strip(' "\n')
+            text = _DUMMY_CLAIM_TEXT if text is None else trunk_to_sentence(text.strip(' "\n'))
 
             reasons.append(Claim(label=label, text=text))
 
         return reasons
 
     @LCELAnalyst.timeout
-    def _describe_options(self, issue, prompt) -> list[str]:
+    async def _describe_options(self, issue, prompt) -> list[str]:
         """Defines and executes LCEL chain for describing basic decision options available."""
 
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                HumanMessage(
-                    content=(
-                        "Assignment: Build a pros & cons list for a given issue.\n\n"
-                        "**Plan**\n"
-                        "Step 1: State the central issue.\n"
-                        "Step 2: Identify the basic options available to an agent who faces the issue.\n"
-                        "Step 3: Construct a pros & cons list for the issue.\n\n"
-                        "**Step 1**\n"
-                        "Let's begin by stating our central issue clearly and concisely:"
-                    )
-                ),
-                AIMessage(content=f'{{"issue"="{issue}"}}'),
-                HumanMessagePromptTemplate.from_template(
-                    "**Step 2**\n"
-                    "What are the basic options available to an agent who needs to address the above issue?\n"
-                    "You may use any hints from the following text, but you don't have to.\n"
-                    "<text>\n{prompt}\n</text>\n"
-                    "Keep your answer short: Sketch each option in 2-6 words only. Prefer imperative mood. "
-                    "Format your answer as valid JSON (i.e., `[{{'option': '...'}}, {{'option': '...'}}, ...]`)."
-                ),
-            ]
-        )
-
-        class Option(BaseModel):
-            option: str
-
-        class OptionList(RootModel):
-            root: list[Option]
-
-        guided_json = OptionList.model_json_schema()
-        gen_args = {"temperature": 0.4, "json_schema": guided_json}
+        gen_args = {"temperature": 0.4, "json_schema": _OPTION_LIST_SCHEMA}
 
         # fmt: off
         chain = (
-            prompt
+            _DESCRIBE_OPTIONS_PROMPT
             | self._model.bind(**gen_args).with_retry()
             | SimpleJsonOutputParser()
         )
         # fmt: on
 
         inputs = {
+            "issue": issue,
             "prompt": prompt,
         }
 
-        result = chain.invoke(inputs)
+        result = await chain.ainvoke(inputs)
 
-        options = [Option(**r).option for r in result]
+        options = [_Option(**r).option for r in result]
 
         return options
 
     @LCELAnalyst.timeout
-    def _build_pros_and_cons(self, reasons: list[Claim], issue: str, options: list[str]) -> ProsConsList:
-        """Builds and executes LCEL chain for building pros and cons list."""
+    async def _build_pros_and_cons(self, reasons: list[Claim], issue: str, options: list[str]) -> ProsConsList:
+        """Builds and executes LCEL chain for drafting alternative pros and cons lists, and picks the best one."""
+
+        if self._build_trivial_proscons and len(reasons) <= 1:
+            self.logger.debug("Less than two reasons, building trivial pros and cons list.")
+            return _trivial_pros_and_cons(reasons, issue, options)
 
-        messages = _MESSAGES_PROS_CONS_PREAMBLE
-        prompt = ChatPromptTemplate.from_messages(messages)
         gen_args = {
             "temperature": 0.4,
             "regex": argdown.REGEX_PROSCONS,
@@ -422,7 +573,7 @@ class ProsConsBuilderLCEL(LCELAnalyst):
 
         # fmt: off
         chain = (
-            prompt
+            _PROS_CONS_PREAMBLE_PROMPT
             | self._model.bind(**gen_args).with_retry()
             | StrOutputParser()
             | RunnableLambda(argdown.parse_proscons)
@@ -436,12 +587,25 @@ class ProsConsBuilderLCEL(LCELAnalyst):
             "formatted_reasons": format_reasons(reasons),
         }
 
-        result = chain.invoke(inputs)
-        result.options = options
+        # identical drafting queries would yield identical cached drafts
+        n_drafts = 1 if self._cache_llm_responses else N_DRAFTS
+
+        # drafts are generated concurrently, failed drafts are discarded
+        results = await chain.abatch(n_drafts * [inputs], config={"max_concurrency": n_drafts}, return_exceptions=True)
+        drafts = [result for result in results if isinstance(result, ProsConsList)]
+        if not drafts:
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                raise errors[0]
+            msg = f"Failed to draft pros and cons list, none of {n_drafts} drafts is a valid ProsConsList."
+            raise ValueError(msg)
+        self.logger.debug("Drafted %s pros and cons lists (of %s).", len(drafts), n_drafts)
 
-        self.logger.debug(f"Pros and cons list: {result.model_dump()}")
+        result = max(drafts, key=lambda draft: _count_used_reasons(draft, reasons))
+        result.options = options
 
-        # TODO: consider drafting alternative pros&cons lists and choosing best
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Pros and cons list: %s", result.model_dump())
 
         return result
 
@@ -464,15 +628,12 @@ class ProsConsBuilderLCEL(LCELAnalyst):
 
         pro_labels = [reason.label for root in pros_and_cons.roots for reason in root.pros]
         con_labels = [reason.label for root in pros_and_cons.roots for reason in root.cons]
-        unused_reasons = [
-            reason.label for reason in reasons
-            if reason.label not in pro_labels + con_labels + [_DUMMY_CLAIM_LABEL]
-        ]
-        hallucinated_pros = [label for label in pro_labels if label not in [reason.label for reason in reasons]]
-        hallucinated_cons = [label for label in con_labels if label not in [reason.label for reason in reasons]]
-        duplicate_reasons = [
-            label for label in set(pro_labels + con_labels) if pro_labels.count(label) + con_labels.count(label) > 1
-        ]
+        reason_labels = {reason.label for reason in reasons}
+        used_labels = {*pro_labels, *con_labels, _DUMMY_CLAIM_LABEL}
+        unused_reasons = [reason.label for reason in reasons if reason.label not in used_labels]
+        hallucinated_pros = [label for label in pro_labels if label not in reason_labels]
+        hallucinated_cons = [label for label in con_labels if label not in reason_labels]
+        duplicate_reasons = [label for label, count in Counter(pro_labels + con_labels).items() if count > 1]
 
         critique: list[str] = []
         for label in unused_reasons:
@@ -494,22 +655,8 @@ class ProsConsBuilderLCEL(LCELAnalyst):
             return pros_and_cons
 
         self.logger.info("Found content-related issues in pros and cons list. Revising ...")
-        self.logger.debug(f"Critique: {critique}")
-
-        messages = copy.deepcopy(_MESSAGES_PROS_CONS_PREAMBLE)
-        messages.extend(
-            [
-                AIMessagePromptTemplate.from_template("{formatted_proscons}"),
-                HumanMessagePromptTemplate.from_template(
-                    "Thanks for the pros and cons list. However, I've noticed the following flaws:\n"
-                    "{formatted_critique}\n"
-                    "Can you please carefully re-read the above instructions, check the pros & cons list you've "
-                    "provided, and correct the errors I pointed out? Please do so by producing a revised pros & "
-                    "cons list below."
-                ),
-            ]
-        )
-        prompt = ChatPromptTemplate.from_messages(messages)
+        self.logger.debug("Critique: %s", critique)
+
         gen_args = {
             "temperature": 0.4,
             "regex": argdown.REGEX_PROSCONS,
@@ -518,7 +665,7 @@ class ProsConsBuilderLCEL(LCELAnalyst):
 
         # fmt: off
         chain = (
-            prompt
+            _PROS_CONS_REVISE_PROMPT
             | self._model.bind(**gen_args).with_retry()
             | StrOutputParser()
             | RunnableLambda(argdown.parse_proscons)
@@ -537,7 +684,8 @@ class ProsConsBuilderLCEL(LCELAnalyst):
         result = chain.invoke(inputs)
         result.options = options
 
-        self.logger.info(f"Revised pros and cons list: {result.model_dump()}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Revised pros and cons list: %s", result.model_dump())
 
         return result
 
@@ -556,26 +704,74 @@ class ProsConsBuilderLCEL(LCELAnalyst):
         # replace empty labels with defaults
         labels = [label if label else f"Reason-{enum}" for enum, label in enumerate(labels)]
 
-        duplicate_labels = [label for label in labels if labels.count(label) > 1]
+        duplicate_labels = {label for label, count in Counter(labels).items() if count > 1}
         if not duplicate_labels:
             return reasons
 
-        unique_reasons = copy.deepcopy(reasons)
+        taken_labels = set(labels)
+        # next suffix to try per duplicate label, so that suffixes already assigned aren't probed again
+        next_suffix: dict[str, int] = dict.fromkeys(duplicate_labels, 1)
+        # claims are immutable, hence a shallow copy suffices
+        unique_reasons = list(reasons)
         for e, reason in enumerate(unique_reasons):
             if reason.label in duplicate_labels:
-                i = 1
+                i = next_suffix[reason.label]
                 new_label = f"{reason.label}-{i!s}"
-                while new_label in labels:
+                while new_label in taken_labels:
                     if i >= MAX_N_REASONS:
                         self.logger.warning("Failed to ensure unique labels for reasons.")
                         break
                     i += 1
                     new_label = f"{reason.label}-{i!s}"
-                labels.append(new_label)
+                next_suffix[reason.label] = i + 1
+                taken_labels.add(new_label)
                 unique_reasons[e] = Claim(label=new_label, text=reason.text)
 
         return unique_reasons
 
+    async def _cached_probes(
+        self, reasons: list[Claim], roots: list[RootClaim], *, use_classifier: bool
+    ) -> tuple[dict[Claim, MultipleChoiceResult], dict[Claim, MultipleChoiceResult]]:
+        """Query most confirmed and most disconfirmed root claims for reasons, probing each reason only once
+
+        Results are memoized per analyst instance (up to MAX_PROBE_CACHE_SIZE entries), so that
+        re-checking an unchanged pros and cons list doesn't trigger further classifier or LLM calls.
+
+        Returns:
+            tuple: most confirmed and most disconfirmed results, keyed by reason
+        """
+        roots_key = tuple(Claim(text=root.text, label=root.label) for root in roots)
+        keys = [(use_classifier, reason, roots_key) for reason in reasons]
+        probes = self._probe_cache.lookup(keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in probes]
+
+        if missing:
+            self.logger.debug("Probing %s of %s reasons (cache misses).", len(missing), len(keys))
+            missing_reasons = [reason for _, reason, _ in missing]
+            claims = len(missing_reasons) * [roots]
+            if use_classifier:
+                coros = [
+                    classifier_queries.most_confirmed(
+                        arguments=missing_reasons, claims=claims, classifier=self._classifier  # type: ignore
+                    ),
+                    classifier_queries.most_disconfirmed(
+                        arguments=missing_reasons, claims=claims, classifier=self._classifier  # type: ignore
+                    ),
+                ]
+            else:
+                coros = [
+                    lcel_queries.most_confirmed(arguments=missing_reasons, claims=claims, model=self._model),  # type: ignore
+                    lcel_queries.most_disconfirmed(arguments=missing_reasons, claims=claims, model=self._model),  # type: ignore
+                ]
+            most_confirmed_array, most_disconfirmed_array = await asyncio.gather(*coros)
+            new_probes = dict(zip(missing, zip(most_confirmed_array, most_disconfirmed_array)))
+            probes.update(new_probes)
+            self._probe_cache.update(new_probes)
+
+        most_confirmed_dict = {reason: probes[key][0] for reason, key in zip(reasons, keys)}
+        most_disconfirmed_dict = {reason: probes[key][1] for reason, key in zip(reasons, keys)}
+        return most_confirmed_dict, most_disconfirmed_dict
+
     async def _check_and_revise_logic2(
         self, pros_and_cons: ProsConsList, reasons: list[Claim], issue: str  # noqa: ARG002
     ) -> ProsConsList:
@@ -586,7 +782,7 @@ class ProsConsBuilderLCEL(LCELAnalyst):
             issue (str): the overarching issue addressed by the pros and cons
 
         Returns:
-            List[Dict]: the revised pros and cons list
+            List[Dict]: the revised pros and cons list (the input list itself if nothing was revised)
 
         For each pro (con) reason *r* targeting root claim *c*:
 
@@ -596,136 +792,77 @@ class ProsConsBuilderLCEL(LCELAnalyst):
 
         """
 
-        class Revision(TypedDict):
-            reason: Claim
-            old_target_idx: int
-            old_val: str
-            new_target_idx: int
-            new_val: str
-
         revisions: list[Revision] = []
 
-        revised_pros_and_cons = copy.deepcopy(pros_and_cons)
-        all_reasons = [reason for root in revised_pros_and_cons.roots for reason in root.pros + root.cons]
+        if len(pros_and_cons.roots) <= 1 or not any(root.pros or root.cons for root in pros_and_cons.roots):
+            return pros_and_cons
 
-        if not all_reasons:
-            return revised_pros_and_cons
+        revised_pros_and_cons = pros_and_cons.model_copy(deep=True)
+        roots = revised_pros_and_cons.roots
+        all_reasons = [reason for root in roots for reason in root.pros + root.cons]
 
-        coros = [
-            lcel_queries.most_confirmed(
-                arguments=all_reasons,
-                claims=len(all_reasons) * [revised_pros_and_cons.roots],  # type: ignore
-                model=self._model,
-            ),
-            lcel_queries.most_disconfirmed(
-                arguments=all_reasons,
-                claims=len(all_reasons) * [revised_pros_and_cons.roots],  # type: ignore
-                model=self._model,
-            ),
-        ]
+        most_confirmed_dict, most_disconfirmed_dict = await self._cached_probes(
+            all_reasons, roots, use_classifier=False
+        )
+        off_target_pros = _off_target(most_confirmed_dict, [root.pros for root in roots])
+        off_target_cons = _off_target(most_disconfirmed_dict, [root.cons for root in roots])
 
-        most_confirmed_array, most_disconfirmed_array = await asyncio.gather(*coros)
-        most_confirmed_dict = dict(zip(all_reasons, most_confirmed_array))
-        most_disconfirmed_dict = dict(zip(all_reasons, most_disconfirmed_array))
+        # candidate revisions that pass the first sanity check
+        candidates: list[Revision] = []
 
-        # TODO: refactor code below so as to batch lcel_queries.valence calls with asyncio.gather
+        # pros (cons) are checked against their most confirmed (disconfirmed) root claim
+        results_by_val = {
+            am.SUPPORT: (most_confirmed_dict, most_disconfirmed_dict),
+            am.ATTACK: (most_disconfirmed_dict, most_confirmed_dict),
+        }
 
-        for enum, root in enumerate(revised_pros_and_cons.roots):
-            for pro in root.pros:
+        for enum, root in enumerate(roots):
+            # pros and cons are visited in a single traversal
+            for reason, off_target, val in chain(
+                zip(root.pros, off_target_pros[enum], repeat(am.SUPPORT)),
+                zip(root.cons, off_target_cons[enum], repeat(am.ATTACK)),
+            ):
                 # check target
-                result_conf = most_confirmed_dict[pro]
-                probs_conf = list(result_conf.probs.values())
-                if max(probs_conf) < 2 * probs_conf[enum]:
+                if not off_target:
                     continue
-
-                old_val = am.SUPPORT
-                new_val = old_val
-                old_target_idx = enum
-                new_target_idx = result_conf.idx_max
+                results_target, results_other = results_by_val[val]
+                new_target_idx = results_target[reason].idx_max
 
                 # sanity check 1
-                result = most_disconfirmed_dict[pro]
-                if result.idx_max == result_conf.idx_max:
+                if results_other[reason].idx_max == new_target_idx:
                     continue
 
-                # sanity check 2
-                result = (
-                    await lcel_queries.valence(
-                        arguments=pro,
-                        claims=revised_pros_and_cons.roots[new_target_idx],
-                        issue=issue,
-                        model=self._model,
+                candidates.append(
+                    Revision(
+                        reason=reason,
+                        old_target_idx=enum,
+                        new_target_idx=new_target_idx,
+                        old_val=val,
+                        new_val=val,
                     )
-                )[0]
-                new_val = result.choices[result.idx_max]
-                if new_val != am.SUPPORT:  # never change valence
-                    continue
-
-                revisions.append(
-                    {
-                        "reason": pro,
-                        "old_target_idx": old_target_idx,
-                        "new_target_idx": new_target_idx,
-                        "old_val": old_val,
-                        "new_val": new_val,
-                    }
                 )
 
-            for con in root.cons:
-                # check target
-                result_disconf = most_disconfirmed_dict[con]
-                probs_disconf = list(result_disconf.probs.values())
-                if max(probs_disconf) < 2 * probs_disconf[enum]:
-                    continue
-
-                old_val = am.ATTACK
-                new_val = old_val
-                old_target_idx = enum
-                new_target_idx = result_disconf.idx_max
-
-                # sanity check 1
-                result = most_confirmed_dict[con]
-                if result.idx_max == result_disconf.idx_max:
-                    continue
-
-                # sanity check 2
-                result = (
-                    await lcel_queries.valence(
-                        arguments=con,
-                        claims=revised_pros_and_cons.roots[new_target_idx],
-                        issue=issue,
-                        model=self._model,
-                    )
-                )[0]
-                new_val = result.choices[result.idx_max]
-                if new_val != am.ATTACK:  # never change valence
-                    continue
+        # sanity check 2, batched: valence w.r.t. new target must match old valence (never change valence)
+        if candidates:
+            valence_results = await lcel_queries.valence(
+                arguments=[candidate.reason for candidate in candidates],
+                claims=[roots[candidate.new_target_idx] for candidate in candidates],
+                issue=issue,
+                model=self._model,
+            )
+            revisions = [
+                candidate
+                for candidate, result in zip(candidates, valence_results)
+                if result.choices[result.idx_max] == candidate.old_val
+            ]
 
-                revisions.append(
-                    {
-                        "reason": con,
-                        "old_target_idx": old_target_idx,
-                        "new_target_idx": new_target_idx,
-                        "old_val": old_val,
-                        "new_val": new_val,
-                    }
-                )
+        self.logger.debug("Identified %s revision of pros and cons list.", len(revisions))
 
-        self.logger.debug(f"Identified {len(revisions)} revision of pros and cons list.")
+        if not revisions:
+            return pros_and_cons
 
         # revise pros and cons list according to revision instructions
-        for revision in revisions:
-            reason = revision["reason"]
-            old_root = revised_pros_and_cons.roots[revision["old_target_idx"]]
-            new_root = revised_pros_and_cons.roots[revision["new_target_idx"]]
-            if revision["old_val"] == am.SUPPORT:
-                old_root.pros.remove(reason)
-            elif revision["old_val"] == am.ATTACK:
-                old_root.cons.remove(reason)
-            if revision["new_val"] == am.SUPPORT:
-                new_root.pros.append(reason)
-            elif revision["new_val"] == am.ATTACK:
-                new_root.cons.append(reason)
+        _apply_revisions(revised_pros_and_cons, revisions)
 
         return revised_pros_and_cons
 
@@ -739,7 +876,7 @@ class ProsConsBuilderLCEL(LCELAnalyst):
             issue (str): the overarching issue addressed by the pros and cons
 
         Returns:
-            List[Dict]: the revised pros and cons list
+            List[Dict]: the revised pros and cons list (the input list itself if nothing was revised)
 
         For each pro (con) reason *r* targeting root claim *c*:
 
@@ -753,118 +890,66 @@ class ProsConsBuilderLCEL(LCELAnalyst):
             self.logger.warning("No classifier available. Using fall-back check-and-revise logic.")
             return await self._check_and_revise_logic2(pros_and_cons, reasons, issue)
 
-        class Revision(TypedDict):
-            reason: Claim
-            old_target_idx: int
-            old_val: str
-            new_target_idx: int
-            new_val: str
-
         revisions: list[Revision] = []
 
-        revised_pros_and_cons = copy.deepcopy(pros_and_cons)
-        all_reasons = [reason for root in revised_pros_and_cons.roots for reason in root.pros + root.cons]
-
-        if not all_reasons or len(revised_pros_and_cons.roots) == 1:
-            return revised_pros_and_cons
-
-        coros = [
-            classifier_queries.most_confirmed(
-                arguments=all_reasons,
-                claims=len(all_reasons) * [revised_pros_and_cons.roots],  # type: ignore
-                classifier=self._classifier,
-            ),
-            classifier_queries.most_disconfirmed(
-                arguments=all_reasons,
-                claims=len(all_reasons) * [revised_pros_and_cons.roots],  # type: ignore
-                classifier=self._classifier,
-            ),
-        ]
-
-        most_confirmed_array, most_disconfirmed_array = await asyncio.gather(*coros)
-        most_confirmed_dict = dict(zip(all_reasons, most_confirmed_array))
-        most_disconfirmed_dict = dict(zip(all_reasons, most_disconfirmed_array))
-
-        for enum, root in enumerate(revised_pros_and_cons.roots):
-            for pro in root.pros:
-                # check target
-                result_conf = most_confirmed_dict[pro]
-                probs_conf = list(result_conf.probs.values())
-                if max(probs_conf) < 2 * probs_conf[enum]:
-                    continue
-
-                old_val = am.SUPPORT
-                new_val = old_val
-                old_target_idx = enum
-                new_target_idx = result_conf.idx_max
-                new_target_label = revised_pros_and_cons.roots[new_target_idx].label
+        if len(pros_and_cons.roots) <= 1 or not any(root.pros or root.cons for root in pros_and_cons.roots):
+            return pros_and_cons
 
-                # sanity check 1
-                result = most_disconfirmed_dict[pro]
-                if result.idx_max == result_conf.idx_max:
-                    continue
+        revised_pros_and_cons = pros_and_cons.model_copy(deep=True)
+        roots = revised_pros_and_cons.roots
+        all_reasons = [reason for root in roots for reason in root.pros + root.cons]
 
-                # sanity check 2
-                if result.probs[new_target_label] > result_conf.probs[new_target_label]:
-                    continue
+        most_confirmed_dict, most_disconfirmed_dict = await self._cached_probes(all_reasons, roots, use_classifier=True)
+        root_labels = tuple(root.label for root in roots)
+        off_target_pros = _off_target(most_confirmed_dict, [root.pros for root in roots])
+        off_target_cons = _off_target(most_disconfirmed_dict, [root.cons for root in roots])
 
-                revisions.append(
-                    {
-                        "reason": pro,
-                        "old_target_idx": old_target_idx,
-                        "new_target_idx": new_target_idx,
-                        "old_val": old_val,
-                        "new_val": new_val,
-                    }
-                )
+        # pros (cons) are checked against their most confirmed (disconfirmed) root claim
+        results_by_val = {
+            am.SUPPORT: (most_confirmed_dict, most_disconfirmed_dict),
+            am.ATTACK: (most_disconfirmed_dict, most_confirmed_dict),
+        }
 
-            for con in root.cons:
+        for enum, root in enumerate(roots):
+            # pros and cons are visited in a single traversal
+            for reason, off_target, val in chain(
+                zip(root.pros, off_target_pros[enum], repeat(am.SUPPORT)),
+                zip(root.cons, off_target_cons[enum], repeat(am.ATTACK)),
+            ):
                 # check target
-                result_disconf = most_disconfirmed_dict[con]
-                probs_disconf = list(result_disconf.probs.values())
-                if max(probs_disconf) < 2 * probs_disconf[enum]:
+                if not off_target:
                     continue
-
-                old_val = am.ATTACK
-                new_val = old_val
-                old_target_idx = enum
-                new_target_idx = result_disconf.idx_max
-                new_target_label = revised_pros_and_cons.roots[new_target_idx].label
+                results_target, results_other = results_by_val[val]
+                result_target = results_target[reason]
+                result_other = results_other[reason]
+                new_target_idx = result_target.idx_max
 
                 # sanity check 1
-                result = most_confirmed_dict[con]
-                if result.idx_max == result_disconf.idx_max:
+                if result_other.idx_max == new_target_idx:
                     continue
 
                 # sanity check 2
-                if result.probs[new_target_label] > result_disconf.probs[new_target_label]:
+                new_target_label = root_labels[new_target_idx]
+                if result_other.probs[new_target_label] > result_target.probs[new_target_label]:
                     continue
 
                 revisions.append(
-                    {
-                        "reason": con,
-                        "old_target_idx": old_target_idx,
-                        "new_target_idx": new_target_idx,
-                        "old_val": old_val,
-                        "new_val": new_val,
-                    }
+                    Revision(
+                        reason=reason,
+                        old_target_idx=enum,
+                        new_target_idx=new_target_idx,
+                        old_val=val,
+                        new_val=val,
+                    )
                 )
 
-        self.logger.debug(f"Identified {len(revisions)} revision of pros and cons list.")
+        self.logger.debug("Identified %s revision of pros and cons list.", len(revisions))
+
+        if not revisions:
+            return pros_and_cons
 
         # revise pros and cons list according to revision instructions
-        for revision in revisions:
-            reason = revision["reason"]
-            old_root = revised_pros_and_cons.roots[revision["old_target_idx"]]
-            new_root = revised_pros_and_cons.roots[revision["new_target_idx"]]
-            if revision["old_val"] == am.SUPPORT:
-                old_root.pros.remove(reason)
-            elif revision["old_val"] == am.ATTACK:
-                old_root.cons.remove(reason)
-            if revision["new_val"] == am.SUPPORT:
-                new_root.pros.append(reason)
-            elif revision["new_val"] == am.ATTACK:
-                new_root.cons.append(reason)
+        _apply_revisions(revised_pros_and_cons, revisions)
 
         return revised_pros_and_cons
 
@@ -893,20 +978,20 @@ class ProsConsBuilderLCEL(LCELAnalyst):
             msg = f"Prompt or completion is None. {self.__class__} requires both prompt and completion to analyze."
             raise ValueError(msg)
 
-        # mine reasons
-        reasons = self._mine_reasons(prompt=prompt, completion=completion, issue=issue)
+        # mine reasons and identify basic options (independent queries, run concurrently)
+        reasons, options = await asyncio.gather(
+            self._mine_reasons(prompt=prompt, completion=completion, issue=issue),
+            self._describe_options(issue=issue, prompt=prompt),
+        )
         if not all(isinstance(reason, Claim) for reason in reasons):
             msg = f"Reasons are not of type Claim. Got {reasons}."
             raise ValueError(msg)
         reasons = self._ensure_unique_labels(reasons)
-        self.logger.debug(f"Mined reasons: {pprint.pformat(reasons)}")
-
-        # identify basic options
-        options = self._describe_options(issue=issue, prompt=prompt)
-        self.logger.debug(f"Identified options: {pprint.pformat(options)}")
+        self.logger.debug("Mined reasons: %r", reasons)
+        self.logger.debug("Identified options: %r", options)
 
         # build pros and cons list
-        pros_and_cons = self._build_pros_and_cons(
+        pros_and_cons = await self._build_pros_and_cons(
             reasons=reasons,
             issue=issue,
             options=options,
@@ -916,32 +1001,36 @@ class ProsConsBuilderLCEL(LCELAnalyst):
             raise ValueError(msg)
 
         # check for missing or duplicate reasons, add unused reasons
-        pros_and_cons = self._check_and_revise_content(
+        revised_pros_and_cons = self._check_and_revise_content(
             reasons=reasons,
             issue=issue,
             options=options,
             pros_and_cons=pros_and_cons,
         )
+        if revised_pros_and_cons is None:
+            # revision timed out, don't pass None on to logic check
+            self.logger.warning("Failed to revise content of pros and cons list, proceeding with unrevised list.")
+        else:
+            pros_and_cons = revised_pros_and_cons
 
-        self.logger.debug(f"Built pros and cons list: {pprint.pformat(pros_and_cons.model_dump())}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Built pros and cons list: %r", pros_and_cons.model_dump())
 
         # double-check and revise
+        built_pros_and_cons = pros_and_cons
         pros_and_cons = await self._check_and_revise_logic(pros_and_cons, reasons, issue)
-        self.logger.debug(f"Revised pros and cons list: {pprint.pformat(pros_and_cons.model_dump())}")
-
-        if pros_and_cons is None:
-            self.logger.warning("Failed to build pros and cons list (pros_and_cons is None).")
 
-        try:
-            pros_and_cons_data = pros_and_cons.model_dump()  # type: ignore
-        except AttributeError:
-            pros_and_cons_data = pros_and_cons.model_dump()
+        # serialize once, for both debug log and artifact
+        pros_and_cons_data = pros_and_cons.model_dump()
+        if pros_and_cons is not built_pros_and_cons and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Revised pros and cons list: %r", pros_and_cons_data)
 
         artifact = Artifact(
             id=self.get_product(),
             description=self.get_description(),
             data=pros_and_cons_data,
-            metadata={"reasons_list": reasons},
+            # plain dicts, like the artifact's data
+            metadata={"reasons_list": _CLAIM_LIST_ADAPTER.dump_python(reasons)},
         )
 
         analysis_state.artifacts.append(artifact)
@@ -29,10 +29,8 @@ flowchart TD
 
 from __future__ import annotations
 
-import asyncio
-import copy
 import json
-import pprint
+import logging
 import random
 import uuid
 from typing import ClassVar, Sequence
@@ -46,15 +44,18 @@ import logikon.schemas.argument_mapping as am
 from logikon.analysts import classifier_queries, lcel_queries
 from logikon.analysts.base import SYSTEM_MESSAGE_PROMPT, ArtifcatAnalystConfig
 from logikon.analysts.lcel_analyst import LCELAnalyst, LCELAnalystConfig
+from logikon.backends.multiple_choice import MultipleChoiceResult
 from logikon.schemas.argument_mapping import ArgMapNode, FuzzyArgMap, FuzzyArgMapEdge
 from logikon.schemas.pros_cons import Claim, ClaimList, ProsConsList, RootClaim
 from logikon.schemas.results import AnalysisState, Artifact
+from logikon.utils.memo import BoundedMemo
 
 MAX_N_RELATIONS = 20
 MAX_LEN_TITLE = 32
 MAX_LEN_GIST = 180
 N_DRAFTS = 3
 LABELS = "ABCDEFG"
+MAX_VALENCE_CACHE_SIZE = 4096  # max number of memoized valence results per analyst
 
 
 ### EXAMPLES ###
@@ -205,6 +206,11 @@ _MESSAGES_UNPACK_REASONS: Sequence[MessageLikeRepresentation] = [
 ]
 
 
+def _more_probable_valence(prob_support: float, prob_attack: float) -> str:
+    """Returns the more probable valence, attack in case of a tie (for LLM- and classifier-based assessments alike)."""
+    return am.SUPPORT if prob_support > prob_attack else am.ATTACK
+
+
 class RelevanceNetworkBuilderConfig(LCELAnalystConfig):
     """RelevanceNetworkBuilderConfig
 
@@ -235,6 +241,11 @@ class RelevanceNetworkBuilderLCEL(LCELAnalyst):
     def __init__(self, config: RelevanceNetworkBuilderConfig):
         super().__init__(config)
         self._keep_pcl_valences = config.keep_pcl_valences
+        # memoized valence query results, keyed by (argument, claim, issue),
+        # least recently used entries are evicted first
+        self._valence_cache: BoundedMemo[tuple[Claim, Claim, str], MultipleChoiceResult] = BoundedMemo(
+            maxsize=MAX_VALENCE_CACHE_SIZE
+        )
 
     def _unpack_reasons(self, reasons: list[Claim], issue: str) -> list[list[Claim]]:
         """Unpacks all reasons and returns list of unpacked reasons"""
@@ -292,7 +303,7 @@ class RelevanceNetworkBuilderLCEL(LCELAnalyst):
             tuples with original and unpacked claims
         """
 
-        pros_and_cons = copy.deepcopy(pros_and_cons)
+        pros_and_cons = pros_and_cons.model_copy(deep=True)
         unpacking = []
 
         # collect and unpack all reasons in one batch
@@ -303,29 +314,28 @@ class RelevanceNetworkBuilderLCEL(LCELAnalyst):
         unpacked_reasons = self._unpack_reasons(reasons=reasons, issue=issue)
         unpacked_dict = dict(zip(reasons, unpacked_reasons))
 
+        # unpacked reasons are replaced by their parts, which are appended at the end of the list
         for root in pros_and_cons.roots:
+            kept = []
             to_be_added = []
-            to_be_removed = []
             for pro in root.pros:
                 unpacked_pros = unpacked_dict[pro]
                 if len(unpacked_pros) > 1:
                     unpacking.append((pro.model_dump(), [claim.model_dump() for claim in unpacked_pros]))
-                    to_be_removed.append(pro)
                     to_be_added.extend(unpacked_pros)
-            for pro in to_be_removed:
-                root.pros.remove(pro)
-            root.pros.extend(to_be_added)
+                else:
+                    kept.append(pro)
+            root.pros = kept + to_be_added
+            kept = []
             to_be_added = []
-            to_be_removed = []
             for con in root.cons:
                 unpacked_cons = unpacked_dict[con]
                 if len(unpacked_cons) > 1:
                     unpacking.append((con.model_dump(), [claim.model_dump() for claim in unpacked_cons]))
-                    to_be_removed.append(con)
                     to_be_added.extend(unpacked_cons)
-            for con in to_be_removed:
-                root.cons.remove(con)
-            root.cons.extend(to_be_added)
+                else:
+                    kept.append(con)
+            root.cons = kept + to_be_added
 
         return pros_and_cons, unpacking
 
@@ -341,20 +351,48 @@ class RelevanceNetworkBuilderLCEL(LCELAnalyst):
         reasontexts_seen = set()
 
         for root in pros_and_cons.roots:
+            # claims are immutable and can be shared between pros and cons lists
             pros = []
             for pro in root.pros:
                 if pro.text not in reasontexts_seen:
-                    pros.append(pro.model_copy())
+                    pros.append(pro)
                 reasontexts_seen.add(pro.text)
             cons = []
             for con in root.cons:
                 if con.text not in reasontexts_seen:
-                    cons.append(con.model_copy())
+                    cons.append(con)
                 reasontexts_seen.add(con.text)
             roots.append(RootClaim(text=root.text, label=root.label, pros=pros, cons=cons))
 
         return ProsConsList(roots=roots, options=pros_and_cons.options)
 
+    async def _cached_valence(
+        self, source_claims: list[Claim], target_claims: list[Claim], issue: str
+    ) -> list[MultipleChoiceResult]:
+        """Query valences for (source, target) pairs, querying each distinct pair only once
+
+        Results are memoized per analyst instance (up to MAX_VALENCE_CACHE_SIZE entries), so that
+        pairs that are assessed repeatedly don't trigger further LLM calls.
+        """
+        keys = [(source, target, issue) for source, target in zip(source_claims, target_claims)]
+        valences = self._valence_cache.lookup(keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in valences]
+
+        if missing:
+            self.logger.debug("Querying valence for %s of %s pairs (cache misses).", len(missing), len(keys))
+            results = await lcel_queries.valence(
+                arguments=[source for source, _, _ in missing],
+                claims=[target for _, target, _ in missing],
+                issue=issue,
+                model=self._model,
+                neutral=True,
+            )
+            new_valences = dict(zip(missing, results))
+            valences.update(new_valences)
+            self._valence_cache.update(new_valences)
+
+        return [valences[key] for key in keys]
+
     # the following function calculates the strength of the argumentative relation between two claims
     async def _relation_strength2(
         self,
@@ -394,57 +432,23 @@ class RelevanceNetworkBuilderLCEL(LCELAnalyst):
         self.logger.debug("Nodes cast as source_claims: %s ..." % source_claims[:3])
         self.logger.debug("Nodes cast as target_claims: %s ..." % target_claims[:3])
 
-        # step 1: valence probs
-        results = await lcel_queries.valence(
-            arguments=source_claims,
-            claims=target_claims,
-            issue=issue,
-            model=self._model,
-        )
+        # valence and strength probs in a single query
+        results = await self._cached_valence(source_claims, target_claims, issue)
 
         valences = [
-            result.choices[result.idx_max] if valence is None else valence for result, valence in zip(results, valences)
+            (
+                _more_probable_valence(result.prob_choice(am.SUPPORT), result.prob_choice(am.ATTACK))
+                if valence is None
+                else valence
+            )
+            for result, valence in zip(results, valences)
         ]
         self.logger.debug("Valences: %s ..." % valences[:3])
 
-        probs_1 = [result.prob_choice(valence) for result, valence in zip(results, valences)]
-        self.logger.debug("Probs_1: %s ..." % probs_1[:3])
+        strengths = [result.prob_choice(valence) for result, valence in zip(results, valences)]
+        self.logger.debug("Strengths: %s ..." % strengths[:3])
 
-        # step 2: strength probs
-        partition = {
-            am.SUPPORT: [idx for idx, val in enumerate(valences) if val == am.SUPPORT],
-            am.ATTACK: [idx for idx, val in enumerate(valences) if val == am.ATTACK],
-        }
-
-        coros = [
-            lcel_queries.supports_q(
-                arguments=[source_claims[idx] for idx in partition[am.SUPPORT]],
-                claims=[target_claims[idx] for idx in partition[am.SUPPORT]],
-                model=self._model,
-            ),
-            lcel_queries.attacks_q(
-                arguments=[source_claims[idx] for idx in partition[am.ATTACK]],
-                claims=[target_claims[idx] for idx in partition[am.ATTACK]],
-                model=self._model,
-            ),
-        ]
-        results_partitioned = dict(zip([am.SUPPORT, am.ATTACK], await asyncio.gather(*coros)))
-        # merge and sort partitioned results
-        # dummy results
-        results = [lcel_queries.MultipleChoiceResult(probs={}, label_max="", idx_max=0)] * len(source_nodes)
-        for val_key in partition.keys():
-            for idx, result in zip(partition[val_key], results_partitioned[val_key]):
-                results[idx] = result
-        if any(result is None for result in results):
-            msg = "Internal error: couldn't merge partitioned results."
-            raise ValueError(msg)
-
-        probs_2 = [result.probs["A"] for result in results]
-        self.logger.debug("Probs_2: %s ..." % probs_2[:3])
-
-        aggregated_probs = [p * q for p, q in zip(probs_1, probs_2)]
-
-        return aggregated_probs, valences  # type: ignore
+        return strengths, valences  # type: ignore
 
     # the following function calculates the strength of the argumentative relation between two claims
     async def _relation_strength(
@@ -495,7 +499,7 @@ class RelevanceNetworkBuilderLCEL(LCELAnalyst):
         if valences is None:
             valences = []
             for mcr in results:
-                valence = am.SUPPORT if mcr.probs[am.SUPPORT] > mcr.probs[am.ATTACK] else am.ATTACK
+                valence = _more_probable_valence(mcr.probs[am.SUPPORT], mcr.probs[am.ATTACK])
                 valences.append(valence)
 
         strengths: list[float] = []
@@ -660,11 +664,13 @@ class RelevanceNetworkBuilderLCEL(LCELAnalyst):
 
         # unpack individual reasons
         pros_and_cons, unpacking = self._unpack_pros_and_cons(pros_and_cons, issue)
-        self.logger.debug(f"Unpacked pros and cons list: {pprint.pformat(pros_and_cons.model_dump())}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Unpacked pros and cons list: %r", pros_and_cons.model_dump())
 
         # remove duplicate reasons
         pros_and_cons = self._remove_duplicates(pros_and_cons)
-        self.logger.debug(f"Cleaned pros and cons list w/o duplicates: {pprint.pformat(pros_and_cons.model_dump())}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Cleaned pros and cons list w/o duplicates: %r", pros_and_cons.model_dump())
 
         # create fuzzy argmap from fuzzy pros and cons list
         relevance_network = FuzzyArgMap()
@@ -51,7 +51,7 @@ class HfClassifier:
 
         if batch_size is None:
             batch_size = self.batch_size
-        batch_size = min(len(inputs), self.batch_size)
+        batch_size = max(min(len(inputs), batch_size), 1)
 
         headers = {"Authorization": f"Bearer {self.api_key}"}
 
@@ -62,8 +62,9 @@ class HfClassifier:
 
         coros = []
 
-        for batch_idx in range(0, len(inputs), self.batch_size):
-            input_batch = inputs[batch_idx : batch_idx + self.batch_size]
+        # all inputs are sent in a single request, unless they exceed batch size
+        for batch_idx in range(0, len(inputs), batch_size):
+            input_batch = inputs[batch_idx : batch_idx + batch_size]
 
             coros.append(
                 query(
@@ -249,7 +249,7 @@ class RecursiveBalancingGuide(AbstractGuide):
 
         yield GuideOutputType.progress, "Brainstorming ..."
         brainstorming = self.deliberate(problem)
-        self.logger.debug(f"Deliberation: {brainstorming}")
+        self.logger.debug("Deliberation: %s", brainstorming)
         protocol += brainstorming
 
         # Argument Mapping
@@ -264,15 +264,16 @@ class RecursiveBalancingGuide(AbstractGuide):
             # get SVG
             svg_artifact = score.get_artifact("svg_argmap")
             svg = svg_artifact.data if svg_artifact else ""
-            self.logger.debug(f"SVG: {svg}")
+            self.logger.debug("SVG: %s", svg)
             yield GuideOutputType.svg_argmap, svg
 
             # Guided balancing
             argmap_artifact = score.get_artifact("fuzzy_argmap_nx")
             if argmap_artifact:
                 argmap = argmap_artifact.data
-                self.logger.debug(f"FuzzyArgmapNX: {nx.node_link_data(argmap)}")
-                yield GuideOutputType.nx_argmap, nx.node_link_data(argmap)
+                argmap_data = nx.node_link_data(argmap)  # serialized once, for both log and output
+                self.logger.debug("FuzzyArgmapNX: %s", argmap_data)
+                yield GuideOutputType.nx_argmap, argmap_data
 
                 yield GuideOutputType.progress, "Evaluating arguments ..."
                 balancing_trace = await self.weigh_reasons(problem=problem, argmap=argmap)
@@ -0,0 +1,44 @@
+"""Bounded memo for query results that are reused within and across analyses."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Generic, Hashable, Iterable, Iterator, Mapping, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BoundedMemo(Generic[K, V]):
+    """Memo with at most `maxsize` entries, least recently used entries are evicted first."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[K]:
+        # from least to most recently used
+        return iter(self._data)
+
+    def lookup(self, keys: Iterable[K]) -> dict[K, V]:
+        """Returns memoized values for those keys that are memoized, and marks them as recently used."""
+        found: dict[K, V] = {}
+        for key in keys:
+            if key in self._data:
+                self._data.move_to_end(key)
+                found[key] = self._data[key]
+        return found
+
+    def update(self, items: Mapping[K, V]) -> None:
+        """Memoizes items, evicting least recently used entries beyond maxsize."""
+        for key, value in items.items():
+            self._data[key] = value
+            self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -0,0 +1,30 @@
+import asyncio
+
+from logikon.analysts import classifier_queries
+from logikon.backends.classifier import HfClassification
+from logikon.schemas.pros_cons import Claim
+
+
+def test_most_relevant_preserves_argument_order():
+    claims_a = [Claim(label="a1", text="claim a1"), Claim(label="a2", text="claim a2")]
+    claims_b = [Claim(label="b1", text="claim b1"), Claim(label="b2", text="claim b2")]
+    arguments = [Claim(label=f"r{i}", text=f"reason {i}") for i in range(3)]
+
+    async def mock_classifier(inputs, hypothesis_template, classes_verbalized):  # noqa: ARG001
+        labels = sorted(classes_verbalized, reverse=True)
+        return [HfClassification(sequence=text, labels=labels, scores=[0.7, 0.3]) for text in inputs]
+
+    results = asyncio.run(
+        classifier_queries.most_confirmed(
+            arguments=arguments,
+            claims=[claims_a, claims_b, claims_a],
+            classifier=mock_classifier,  # type: ignore
+        )
+    )
+
+    assert [result.label_max for result in results] == ["a2", "b2", "a2"]
+    assert [result.idx_max for result in results] == [1, 1, 1]
+    assert results[1].choices == claims_b
+    # probs are aligned with choices
+    assert list(results[0].probs) == ["a1", "a2"]
+    assert list(results[0].probs.values()) == [0.3, 0.7]
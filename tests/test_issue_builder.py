@@ -0,0 +1,56 @@
+# test issue builder
+
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from logikon.analysts.lcel_analyst import LCELAnalystConfig
+from logikon.analysts.reconstruction.issue_builder_lcel import N_DRAFTS, QUESTIONS_EVAL, Draft, IssueBuilderLCEL
+
+
+def test_key_issue_falls_back_on_invalid_json():
+    config = LCELAnalystConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = IssueBuilderLCEL(config)
+
+    def mock_model(messages, **kwargs):  # noqa: ARG001
+        # json mode returns an object without "issue" key
+        if "json_schema" in kwargs:
+            return AIMessage(content="{}")
+        return AIMessage(content="<ISSUE>Should we ban bullfighting?</ISSUE>")
+
+    analyst._model = RunnableLambda(mock_model)  # type: ignore
+
+    drafts = asyncio.run(analyst._key_issue(prompt="prompt", completion="completion"))
+
+    assert len(drafts) == N_DRAFTS
+    assert all(draft.text == "Should we ban bullfighting?" for draft in drafts)
+
+
+def test_rate_issue_drafts_with_invalid_answers():
+    config = LCELAnalystConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = IssueBuilderLCEL(config)
+    alternatives = [Draft(text="Issue A?", label="A"), Draft(text="Issue B?", label="B")]
+
+    calls = []
+
+    def mock_model(messages, **kwargs):  # noqa: ARG001
+        calls.append(messages)
+        # free text instead of one label per question
+        return AIMessage(content="A, I think")
+
+    analyst._model = RunnableLambda(mock_model)  # type: ignore
+
+    label = asyncio.run(
+        analyst._rate_issue_drafts(alternatives, QUESTIONS_EVAL, prompt="prompt", completion="completion")
+    )
+
+    assert label is None
+    # step 2 dialogue is skipped
+    assert len(calls) == 1
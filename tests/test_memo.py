@@ -0,0 +1,12 @@
+from logikon.utils.memo import BoundedMemo
+
+
+def test_bounded_memo():
+    memo: BoundedMemo[str, int] = BoundedMemo(maxsize=2)
+    memo.update({"a": 1, "b": 2})
+    assert memo.lookup(["a", "c"]) == {"a": 1}
+
+    # "b" is least recently used
+    memo.update({"c": 3})
+    assert list(memo) == ["a", "c"]
+    assert len(memo) == 2
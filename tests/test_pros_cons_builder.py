@@ -1,10 +1,26 @@
 # test score function
 
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+import logikon.schemas.argument_mapping as am
+from logikon.analysts import classifier_queries, lcel_queries
 from logikon.analysts.reconstruction.pros_cons_builder_lcel import (
     EXAMPLES_ISSUE_PROSCONS,
+    ProsConsBuilderConfig,
+    ProsConsBuilderLCEL,
+    _count_used_reasons,
+    _off_target,
     format_examples,
     format_proscons,
 )
+from logikon.backends.multiple_choice import MultipleChoiceResult
+from logikon.schemas.pros_cons import Claim, ProsConsList, RootClaim
+from logikon.schemas.results import INPUT_KWS, AnalysisState, Artifact
+from logikon.utils import argdown
 
 
 def test_examples():
@@ -16,3 +32,296 @@ def test_examples():
     print(formatted_examples)  # noqa: T201
     assert formatted_examples.startswith("<example>")
     assert formatted_examples.endswith("</example>")
+
+
+def test_format_proscons_deterministic():
+    reasons = [Claim(label=f"Reason {i}", text=f"Reason {i}.") for i in range(5)]
+    proscons = ProsConsList(roots=[])
+
+    formatted = format_proscons("issue", proscons, extra_reasons=reasons)
+    assert formatted == format_proscons("issue", proscons, extra_reasons=reasons[::-1])
+
+
+def test_count_used_reasons():
+    _, proscons = EXAMPLES_ISSUE_PROSCONS[0]
+    reasons = [
+        Claim(label="Cruelty", text="Bullfighting is cruelty for the purpose of entertainment."),
+        Claim(label="Cultural value", text="Bullfighting is part of history and local cultures."),
+        Claim(label="Tourism", text="Bullfighting attracts tourists."),
+    ]
+    assert _count_used_reasons(proscons, reasons) == 2
+    assert _count_used_reasons(proscons, []) == 0
+
+
+def test_off_target():
+    reasons = [Claim(label=f"r{i}", text=f"Reason {i}.") for i in range(3)]
+    results = {
+        reasons[0]: MultipleChoiceResult(probs={"A": 0.6, "B": 0.4}, label_max="A", idx_max=0),
+        reasons[1]: MultipleChoiceResult(probs={"A": 0.7, "B": 0.3}, label_max="A", idx_max=0),
+        reasons[2]: MultipleChoiceResult(probs={"A": 0.2, "B": 0.8}, label_max="B", idx_max=1),
+    }
+
+    assert _off_target(results, [[reasons[0]], [reasons[1], reasons[2]]]) == [[False], [True, False]]
+    assert _off_target(results, [[], []]) == [[], []]
+
+
+def test_cache_llm_responses():
+    config = ProsConsBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    assert ProsConsBuilderLCEL(config)._model.cache is None
+
+    config = ProsConsBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+        cache_llm_responses=True,
+    )
+    assert ProsConsBuilderLCEL(config)._model.cache is not None
+
+
+def test_ensure_unique_labels():
+    config = ProsConsBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = ProsConsBuilderLCEL(config)
+    reasons = [
+        Claim(label="A", text="Reason 1."),
+        Claim(label="A", text="Reason 2."),
+        Claim(label="A-1", text="Reason 3."),
+        Claim(label="B", text="Reason 4."),
+    ]
+    unique_reasons = analyst._ensure_unique_labels(reasons)
+    assert [reason.label for reason in unique_reasons] == ["A-2", "A-3", "A-1", "B"]
+    assert [reason.text for reason in unique_reasons] == [reason.text for reason in reasons]
+    assert analyst._ensure_unique_labels(reasons[2:]) == reasons[2:]
+
+
+def test_check_and_revise_logic2(monkeypatch):
+    config = ProsConsBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = ProsConsBuilderLCEL(config)
+
+    pro1 = Claim(label="Pro 1", text="Pro 1.")
+    pro2 = Claim(label="Pro 2", text="Pro 2.")
+    con1 = Claim(label="Con 1", text="Con 1.")
+    pros_and_cons = ProsConsList(
+        roots=[
+            RootClaim(label="Root 1", text="Root 1.", pros=[pro1, pro2], cons=[con1]),
+            RootClaim(label="Root 2", text="Root 2.", pros=[], cons=[]),
+        ]
+    )
+
+    def _result(idx_max: int) -> MultipleChoiceResult:
+        probs = {"A": 0.9, "B": 0.1} if idx_max == 0 else {"A": 0.1, "B": 0.9}
+        return MultipleChoiceResult(probs=probs, label_max="AB"[idx_max], idx_max=idx_max)
+
+    probe_calls = []
+
+    async def mock_most_confirmed(arguments, claims, model):  # noqa: ARG001
+        probe_calls.append(arguments)
+        return [_result(1) if argument in (pro1, pro2) else _result(0) for argument in arguments]
+
+    async def mock_most_disconfirmed(arguments, claims, model):  # noqa: ARG001
+        return [_result(0) if argument in (pro1, pro2) else _result(1) for argument in arguments]
+
+    valence_calls = []
+
+    async def mock_valence(arguments, claims, issue, model, *, neutral=False):  # noqa: ARG001
+        valence_calls.append(arguments)
+        results = []
+        for argument in arguments:
+            # pro1 supports new target, pro2 and con1 change valence w.r.t. new target
+            choices = [am.SUPPORT, am.ATTACK] if argument in (pro1, con1) else [am.ATTACK, am.SUPPORT]
+            results.append(MultipleChoiceResult(probs={"A": 0.9, "B": 0.1}, label_max="A", idx_max=0, choices=choices))
+        return results
+
+    monkeypatch.setattr(lcel_queries, "most_confirmed", mock_most_confirmed)
+    monkeypatch.setattr(lcel_queries, "most_disconfirmed", mock_most_disconfirmed)
+    monkeypatch.setattr(lcel_queries, "valence", mock_valence)
+
+    revised = asyncio.run(analyst._check_and_revise_logic2(pros_and_cons, [pro1, pro2, con1], "issue"))
+
+    # all candidates are checked in a single valence query
+    assert valence_calls == [[pro1, pro2, con1]]
+    # only pro1 is moved, as it keeps its valence w.r.t. new target
+    assert revised.roots[0].pros == [pro2]
+    assert revised.roots[0].cons == [con1]
+    assert revised.roots[1].pros == [pro1]
+    assert revised.roots[1].cons == []
+
+    # probes are memoized per reason and root claims
+    asyncio.run(analyst._check_and_revise_logic2(pros_and_cons, [pro1, pro2, con1], "issue"))
+    assert probe_calls == [[pro1, pro2, con1]]
+
+    # memo is bounded, least recently used probes are evicted
+    analyst._probe_cache.maxsize = 2
+    analyst._probe_cache.clear()
+    revised = asyncio.run(analyst._check_and_revise_logic2(pros_and_cons, [pro1, pro2, con1], "issue"))
+    assert len(analyst._probe_cache) == 2
+    assert revised.roots[1].pros == [pro1]
+
+
+def test_check_and_revise_logic(monkeypatch):
+    config = ProsConsBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = ProsConsBuilderLCEL(config)
+    analyst._classifier = object()  # type: ignore
+
+    pro1 = Claim(label="Pro 1", text="Pro 1.")
+    pro2 = Claim(label="Pro 2", text="Pro 2.")
+    con1 = Claim(label="Con 1", text="Con 1.")
+    pros_and_cons = ProsConsList(
+        roots=[
+            RootClaim(label="Root 1", text="Root 1.", pros=[pro1, pro2], cons=[con1]),
+            RootClaim(label="Root 2", text="Root 2.", pros=[], cons=[]),
+        ]
+    )
+
+    def _result(idx_max: int, p_max: float = 0.9) -> MultipleChoiceResult:
+        probs = {"Root 1": p_max, "Root 2": 1 - p_max} if idx_max == 0 else {"Root 1": 1 - p_max, "Root 2": p_max}
+        return MultipleChoiceResult(probs=probs, label_max=f"Root {idx_max + 1}", idx_max=idx_max)
+
+    async def mock_most_confirmed(arguments, claims, classifier):  # noqa: ARG001
+        return [_result(1) if argument in (pro1, pro2) else _result(0) for argument in arguments]
+
+    async def mock_most_disconfirmed(arguments, claims, classifier):  # noqa: ARG001
+        # pro2 fails sanity check 1 (most disconfirmed is new target, too)
+        return [_result(1, 0.6) if argument == pro2 else _result(0, 0.6) for argument in arguments]
+
+    monkeypatch.setattr(classifier_queries, "most_confirmed", mock_most_confirmed)
+    monkeypatch.setattr(classifier_queries, "most_disconfirmed", mock_most_disconfirmed)
+
+    revised = asyncio.run(analyst._check_and_revise_logic(pros_and_cons, [pro1, pro2, con1], "issue"))
+
+    assert revised.roots[0].pros == [pro2]
+    assert revised.roots[0].cons == [con1]
+    assert revised.roots[1].pros == [pro1]
+    assert revised.roots[1].cons == []
+    # input is left untouched
+    assert pros_and_cons.roots[0].pros == [pro1, pro2]
+
+    # nothing to revise, input list is returned as is
+    single_root = ProsConsList(roots=pros_and_cons.roots[:1])
+    assert asyncio.run(analyst._check_and_revise_logic(single_root, [pro1, pro2, con1], "issue")) is single_root
+    no_reasons = ProsConsList(roots=[root.model_copy(update={"pros": [], "cons": []}) for root in pros_and_cons.roots])
+    assert asyncio.run(analyst._check_and_revise_logic(no_reasons, [], "issue")) is no_reasons
+
+
+def test_build_trivial_pros_and_cons():
+    config = ProsConsBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+        build_trivial_proscons=True,
+    )
+    analyst = ProsConsBuilderLCEL(config)
+    reason = Claim(label="Cruelty", text="Bullfighting is cruelty for the purpose of entertainment.")
+
+    pros_and_cons = asyncio.run(analyst._build_pros_and_cons([reason], "Bullfighting?", ["Ban bullfighting"]))
+    assert len(pros_and_cons.roots) == 1
+    assert pros_and_cons.roots[0].label == "Ban bullfighting"
+    assert pros_and_cons.roots[0].pros == [reason]
+    assert pros_and_cons.options == ["Ban bullfighting"]
+
+    # single root claim without reasons, rather than empty list
+    pros_and_cons = asyncio.run(analyst._build_pros_and_cons([], "Bullfighting?", []))
+    assert len(pros_and_cons.roots) == 1
+    assert pros_and_cons.roots[0].text == "Bullfighting?"
+    assert pros_and_cons.roots[0].pros == []
+    assert pros_and_cons.roots[0].cons == []
+
+
+def test_build_pros_and_cons_with_invalid_drafts(monkeypatch):
+    config = ProsConsBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = ProsConsBuilderLCEL(config)
+    analyst._model = RunnableLambda(lambda messages, **kwargs: AIMessage(content="no list"))  # type: ignore  # noqa: ARG005
+    monkeypatch.setattr(argdown, "parse_proscons", lambda text: None)  # noqa: ARG005
+
+    reasons = [Claim(label="Pro 1", text="Pro 1."), Claim(label="Con 1", text="Con 1.")]
+    with pytest.raises(ValueError, match="none of 3 drafts"):
+        asyncio.run(analyst._build_pros_and_cons(reasons, "Issue?", ["Option"]))
+
+
+def test_build_pros_and_cons_with_cache(monkeypatch):
+    config = ProsConsBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+        cache_llm_responses=True,
+    )
+    analyst = ProsConsBuilderLCEL(config)
+    calls = []
+
+    def mock_model(messages, **kwargs):  # noqa: ARG001
+        calls.append(messages)
+        return AIMessage(content="pros and cons")
+
+    reasons = [Claim(label="Pro 1", text="Pro 1."), Claim(label="Con 1", text="Con 1.")]
+    draft = ProsConsList(roots=[RootClaim(label="Root", text="Root.", pros=reasons[:1], cons=reasons[1:])])
+    analyst._model = RunnableLambda(mock_model)  # type: ignore
+    monkeypatch.setattr(argdown, "parse_proscons", lambda text: draft.model_copy(deep=True))  # noqa: ARG005
+
+    # drafts would be identical, so pros and cons list is drafted only once
+    pros_and_cons = asyncio.run(analyst._build_pros_and_cons(reasons, "Issue?", ["Option"]))
+    assert len(calls) == 1
+    assert pros_and_cons.roots == draft.roots
+
+
+def test_analyze_with_failed_content_revision(monkeypatch):
+    config = ProsConsBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = ProsConsBuilderLCEL(config)
+
+    reasons = [Claim(label="Pro 1", text="Pro 1."), Claim(label="Con 1", text="Con 1.")]
+    draft = ProsConsList(
+        roots=[RootClaim(label="Root", text="Root.", pros=reasons[:1], cons=reasons[1:])],
+        options=["Root"],
+    )
+    logic_checked = []
+
+    async def mock_mine_reasons(prompt, completion, issue):  # noqa: ARG001
+        return reasons
+
+    async def mock_describe_options(issue, prompt):  # noqa: ARG001
+        return ["Root"]
+
+    async def mock_build_pros_and_cons(reasons, issue, options):  # noqa: ARG001
+        return draft
+
+    def mock_check_and_revise_content(reasons, issue, options, pros_and_cons):  # noqa: ARG001
+        return None  # e.g., timeout
+
+    async def mock_check_and_revise_logic(pros_and_cons, reasons, issue):  # noqa: ARG001
+        logic_checked.append(pros_and_cons)
+        return pros_and_cons
+
+    monkeypatch.setattr(analyst, "_mine_reasons", mock_mine_reasons)
+    monkeypatch.setattr(analyst, "_describe_options", mock_describe_options)
+    monkeypatch.setattr(analyst, "_build_pros_and_cons", mock_build_pros_and_cons)
+    monkeypatch.setattr(analyst, "_check_and_revise_content", mock_check_and_revise_content)
+    monkeypatch.setattr(analyst, "_check_and_revise_logic", mock_check_and_revise_logic)
+
+    analysis_state = AnalysisState(
+        inputs=[
+            Artifact(id=INPUT_KWS.prompt, description="prompt", data="Prompt."),
+            Artifact(id=INPUT_KWS.completion, description="completion", data="Completion."),
+        ],
+        artifacts=[Artifact(id="issue", description="issue", data="Issue?")],
+    )
+    asyncio.run(analyst._analyze(analysis_state))
+
+    # unrevised draft is passed on to logic check
+    assert logic_checked == [draft]
+    artifact = analysis_state.artifacts[-1]
+    assert artifact.id == "proscons"
+    assert artifact.data == draft.model_dump()
+    assert artifact.metadata == {"reasons_list": [reason.model_dump() for reason in reasons]}
@@ -1,10 +1,15 @@
+import asyncio
+
 import pytest
 
 import logikon.schemas.argument_mapping as am
+from logikon.analysts import classifier_queries, lcel_queries
 from logikon.analysts.reconstruction.relevance_network_builder_lcel import (
     RelevanceNetworkBuilderConfig,
     RelevanceNetworkBuilderLCEL,
 )
+from logikon.backends.multiple_choice import MultipleChoiceResult
+from logikon.schemas.pros_cons import Claim, ProsConsList, RootClaim
 
 
 @pytest.fixture(name="map1")
@@ -46,3 +51,113 @@ def test_dialectic_equivalence(map1: am.FuzzyArgMap):
     assert not analyst._dialectically_equivalent(map1, map1.nodelist[3], map1.nodelist[5])
 
     assert not analyst._dialectically_equivalent(map1, map1.nodelist[4], map1.nodelist[5])
+
+
+def test_cached_valence(monkeypatch):
+    config = RelevanceNetworkBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = RelevanceNetworkBuilderLCEL(config)
+
+    queried = []
+
+    async def mock_valence(arguments, claims, issue, model, *, neutral=False):  # noqa: ARG001
+        queried.extend(zip(arguments, claims))
+        return [
+            MultipleChoiceResult(
+                probs={"A": 0.6, "B": 0.3, "C": 0.1},
+                label_max="A",
+                idx_max=0,
+                choices=[am.SUPPORT, am.ATTACK, am.NEUTRAL],
+            )
+            for _ in arguments
+        ]
+
+    monkeypatch.setattr(lcel_queries, "valence", mock_valence)
+
+    c1 = Claim(label="c1", text="claim 1")
+    c2 = Claim(label="c2", text="claim 2")
+    c3 = Claim(label="c3", text="claim 3")
+
+    results = asyncio.run(analyst._cached_valence([c1, c2, c1], [c3, c3, c3], issue="issue"))
+    assert len(results) == 3
+    assert results[0] is results[2]
+    assert len(queried) == 2
+
+    results = asyncio.run(analyst._cached_valence([c2, c3], [c3, c1], issue="issue"))
+    assert len(results) == 2
+    assert len(queried) == 3
+
+    # memo is bounded, least recently used pairs are evicted
+    analyst._valence_cache.maxsize = 2
+    asyncio.run(analyst._cached_valence([c1], [c2], issue="issue"))
+    assert list(analyst._valence_cache) == [(c3, c1, "issue"), (c1, c2, "issue")]
+    asyncio.run(analyst._cached_valence([c1], [c3], issue="issue"))
+    assert queried[-1] == (c1, c3)
+
+
+def test_relation_strength_tie(monkeypatch):
+    config = RelevanceNetworkBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = RelevanceNetworkBuilderLCEL(config)
+
+    async def mock_valence(arguments, claims, issue, model, *, neutral=False):  # noqa: ARG001
+        return [
+            MultipleChoiceResult(
+                probs={"A": 0.4, "B": 0.4, "C": 0.2},
+                label_max="A",
+                idx_max=0,
+                choices=[am.SUPPORT, am.ATTACK, am.NEUTRAL],
+            )
+            for _ in arguments
+        ]
+
+    async def mock_dialectic_relations(arguments, claims, classifier):  # noqa: ARG001
+        return [
+            MultipleChoiceResult(
+                probs={am.SUPPORT: 0.4, am.ATTACK: 0.4, am.NEUTRAL: 0.2}, label_max=am.SUPPORT, idx_max=0
+            )
+            for _ in arguments
+        ]
+
+    monkeypatch.setattr(lcel_queries, "valence", mock_valence)
+    monkeypatch.setattr(classifier_queries, "dialectic_relations", mock_dialectic_relations)
+
+    source = am.ArgMapNode(text="pro 0", label="pro0", annotations=[], node_type=am.REASON, id="n0")
+    target = am.ArgMapNode(text="claim 0", label="claim0", annotations=[], node_type=am.CENTRAL_CLAIM, id="n1")
+
+    # LLM- and classifier-based assessments break ties alike
+    _, valences_llm = asyncio.run(analyst._relation_strength([source], [target], issue="issue"))
+    analyst._classifier = object()  # type: ignore
+    _, valences_classifier = asyncio.run(analyst._relation_strength([source], [target], issue="issue"))
+    assert valences_llm == valences_classifier == [am.ATTACK]
+
+
+def test_unpack_pros_and_cons(monkeypatch):
+    config = RelevanceNetworkBuilderConfig(
+        inference_server_url="localhost",
+        expert_model="gpt2",
+    )
+    analyst = RelevanceNetworkBuilderLCEL(config)
+
+    pro1 = Claim(label="pro1", text="pro 1")
+    pro2 = Claim(label="pro2", text="pro 2")
+    con1 = Claim(label="con1", text="con 1")
+    parts = [Claim(label="pro1a", text="pro 1a"), Claim(label="pro1b", text="pro 1b")]
+
+    def mock_unpack_reasons(reasons, issue):  # noqa: ARG001
+        return [parts if reason == pro1 else [reason] for reason in reasons]
+
+    monkeypatch.setattr(analyst, "_unpack_reasons", mock_unpack_reasons)
+
+    pros_and_cons = ProsConsList(roots=[RootClaim(label="root", text="root", pros=[pro1, pro2], cons=[con1])])
+    unpacked, unpacking = analyst._unpack_pros_and_cons(pros_and_cons, issue="issue")
+
+    assert unpacked.roots[0].pros == [pro2, *parts]
+    assert unpacked.roots[0].cons == [con1]
+    assert unpacking == [(pro1.model_dump(), [part.model_dump() for part in parts])]
+    # input is left untouched
+    assert pros_and_cons.roots[0].pros == [pro1, pro2]